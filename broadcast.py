@@ -0,0 +1,473 @@
+import itertools
+import math
+import secrets
+import threading
+import time
+import zlib
+from collections import deque
+
+from telemetry import FIELDS, sample_json, aggregate_json, batch_json, pack_frame
+
+AGGREGATIONS = ('latest', 'mean', 'minmax')
+MAX_RATE = 1000.0
+# What to do with a subscriber that falls more than `buffer` events behind
+POLICIES = ('drop_oldest', 'latest', 'disconnect')
+DEFAULT_BUFFER = 512
+# Events kept per view log; a buffer beyond it would lose events to wraparound unnoticed
+LOG_EVENTS = 4096
+# Micro-batches (?batch=MS): longest window, and most samples per event
+MAX_BATCH_MS = 1000.0
+BATCH_SAMPLES = 500
+
+class EventLog:
+    """
+    Bounded history of events (or Samples) with a running sequence number.
+    The producer appends whole batches; any number of readers wait on one
+    condition and pick up everything after the sequence they last saw.
+    """
+
+    def __init__(self, maxlen=LOG_EVENTS):
+        self.seq = 0
+        self._events = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+
+    def extend(self, events):
+        if not events:
+            return
+        with self._cond:
+            self._events.extend(events)
+            self.seq += len(events)
+            self._cond.notify_all()
+
+    def since(self, seq, timeout=None):
+        """
+        (new seq, events after seq, number already dropped from the log)
+        — waits up to timeout for at least one.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq > seq, timeout)
+            n = min(self.seq - seq, len(self._events))
+            return (self.seq, list(itertools.islice(self._events, len(self._events) - n, None)),
+                    self.seq - seq - n)
+
+class Decimator:
+    """
+    Reduces samples to at most `rate` events per second per device, on
+    fixed windows of the sample time:
+      latest  the first sample of each window, sent as soon as it arrives
+      mean    per-field mean of the window, sent when the window closes
+      minmax  per-field [min, max] envelope, sent when the window closes
+    """
+
+    def __init__(self, rate, agg='latest'):
+        self.period = 1.0 / rate
+        self.agg = agg
+        # device -> [window index, count, sums, mins, maxs, last t, first seq] (index only for latest)
+        self._open = {}
+        self._last_id = 0
+
+    def add(self, samples, seqs):
+        """
+        (id, encoded event) for the windows these samples complete (or
+        open, for latest); seqs are the samples' ids. A closed window's id
+        is the last sample it covers, or with several devices the last one
+        before the oldest window still open, so that resuming after it
+        misses nothing; None when that has not advanced.
+        """
+        if self.agg == 'latest':
+            kept, kept_seqs = self.keep(samples, seqs)
+            return [(seq, sample_json(sample)) for sample, seq in zip(kept, kept_seqs)]
+        events = []
+        for sample, seq in zip(samples, seqs):
+            index = math.floor(sample.t / self.period)
+            state = self._open.get(sample.device)
+            if state is not None and state[0] == index:
+                self._accumulate(state, sample)
+                continue
+            closed = state
+            state = [index, 0, [0.0] * len(FIELDS), [math.inf] * len(FIELDS),
+                     [-math.inf] * len(FIELDS), sample.t, seq]
+            self._open[sample.device] = state
+            self._accumulate(state, sample)
+            if closed is not None:
+                covered = min(open_state[6] for open_state in self._open.values()) - 1
+                event_id = covered if covered > self._last_id else None
+                self._last_id = max(covered, self._last_id)
+                events.append((event_id, self._encode(sample.device, closed)))
+        return events
+
+    def keep(self, samples, seqs):
+        """For agg='latest': the samples that open a new window, and their ids."""
+        kept, kept_seqs = [], []
+        for sample, seq in zip(samples, seqs):
+            index = math.floor(sample.t / self.period)
+            if self._open.get(sample.device) != index:
+                self._open[sample.device] = index
+                kept.append(sample)
+                kept_seqs.append(seq)
+        return kept, kept_seqs
+
+    def flush(self, head):
+        """(id, encoded event) for every open mean/minmax window, oldest first; head is the last id."""
+        if self.agg == 'latest':
+            return []
+        events = []
+        for device, state in sorted(self._open.items(), key=lambda item: item[1][6]):
+            del self._open[device]
+            covered = min((open_state[6] for open_state in self._open.values()), default=head + 1) - 1
+            event_id = covered if covered > self._last_id else None
+            self._last_id = max(covered, self._last_id)
+            events.append((event_id, self._encode(device, state)))
+        return events
+
+    def _accumulate(self, state, sample):
+        state[1] += 1
+        state[5] = sample.t
+        sums, mins, maxs = state[2], state[3], state[4]
+        for i, value in enumerate(sample[2:]):
+            sums[i] += value
+            if value < mins[i]:
+                mins[i] = value
+            if value > maxs[i]:
+                maxs[i] = value
+
+    def _encode(self, device, state):
+        _, n, sums, mins, maxs, t, _ = state
+        if self.agg == 'mean':
+            columns = {field: sums[i] / n for i, field in enumerate(FIELDS)}
+        else:
+            # NaN never wins a comparison, so an all-NaN field keeps its ±inf start
+            columns = {field: (mins[i], maxs[i]) if mins[i] <= maxs[i] else (math.nan, math.nan)
+                       for i, field in enumerate(FIELDS)}
+        return aggregate_json(device, t, self.agg, n, columns)
+
+class Batcher:
+    """
+    Packs samples into one event per batch (columnar JSON by default, or
+    any encode(samples)): a batch is sent once `window` seconds have
+    passed since its first sample, or as soon as it holds max_samples.
+    The time limit is checked whenever the producer publishes, which it
+    does at least once per read timeout; window=0 sends each publish.
+    """
+
+    def __init__(self, window, max_samples=BATCH_SAMPLES, encode=batch_json):
+        self.window = window
+        self.max_samples = max_samples
+        self.encode = encode
+        self._pending = []
+        self._pending_seqs = []
+        self._started = 0.0
+
+    def add(self, samples, seqs):
+        """(id of its last sample, encoded event) for the batches that are full or due."""
+        if samples and not self._pending:
+            self._started = time.monotonic()
+        self._pending.extend(samples)
+        self._pending_seqs.extend(seqs)
+        events = []
+        while len(self._pending) >= self.max_samples:
+            events.append((self._pending_seqs[self.max_samples - 1],
+                           self.encode(self._pending[:self.max_samples])))
+            del self._pending[:self.max_samples]
+            del self._pending_seqs[:self.max_samples]
+            self._started = time.monotonic()
+        if self._pending and time.monotonic() - self._started >= self.window:
+            events.append((self._pending_seqs[-1], self.encode(self._pending)))
+            self._pending = []
+            self._pending_seqs = []
+        return events
+
+    def flush(self):
+        """The pending batch as (id, encoded event), if any, whether due or not."""
+        if not self._pending:
+            return []
+        events = [(self._pending_seqs[-1], self.encode(self._pending))]
+        self._pending = []
+        self._pending_seqs = []
+        return events
+
+def _pack_frame_zlib(samples):
+    return zlib.compress(pack_frame(samples), 1)
+
+# Binary frame encodings for WebSocket subscribers
+FRAME_ENCODINGS = {'raw': pack_frame, 'zlib': _pack_frame_zlib}
+
+class Broadcaster:
+    """
+    Fans samples out to SSE and WebSocket subscribers.
+    Samples are encoded once into the full-rate JSON log; every distinct
+    (rate, agg, batch, frame encoding) that some subscriber asked for gets
+    one Decimator and/or Batcher and one log, shared by all subscribers of
+    that view and dropped when the last one leaves. Per-sample work
+    therefore depends on the number of distinct views, not on the number
+    of clients.
+
+    Events carry ids 'epoch-n': n is the number of samples published up
+    to the last one the event covers, so ids increase within every view
+    and stay valid when a view is dropped and recreated; the epoch is new
+    for each Broadcaster, so ids from another run or stream are ignored.
+    The last `maxlen` Samples are kept too, and a reconnecting client that
+    sends the id it last saw first gets what it missed as one columnar
+    'replay' event.
+
+    The producer never waits for subscribers: each one only keeps a cursor
+    into its view's bounded log, and when it falls more than `buffer`
+    events behind (a stalled or slow connection) its policy decides:
+      drop_oldest  skip ahead, sending the newest `buffer` events
+      latest       skip to the single newest event (a snapshot)
+      disconnect   end the stream
+    """
+
+    def __init__(self, maxlen=LOG_EVENTS):
+        self.maxlen = maxlen
+        self.epoch = secrets.token_hex(4)
+        self.raw = EventLog(maxlen)       # (id, JSON) of every sample
+        self.recent = EventLog(maxlen)    # the Samples themselves, for replays
+        self._views = {}   # (rate, agg, batch, frame) -> [Decimator, Batcher, EventLog of (id, event), subscriber count]
+        self._subscribers = {}   # id -> counters of one connected subscriber
+        self._ids = itertools.count(1)
+        self.dropped = dict.fromkeys(POLICIES, 0)
+        self.disconnected = 0
+        # Whether some view was left with a batch window open by the last publish
+        self.pending = False
+        self._lock = threading.Lock()
+
+    def publish(self, samples):
+        """
+        Add a batch of Samples (called from the single producer thread).
+        Call it with [] on read timeouts too, so micro-batches of a stalled
+        source still go out (only needed while self.pending), and call
+        flush() when the source ends.
+        """
+        seqs = range(self.raw.seq + 1, self.raw.seq + 1 + len(samples))
+        if samples:
+            # Retained for replays before the ids are handed out, so a reconnect
+            # that already knows an id always finds the samples after it
+            self.recent.extend(samples)
+            self.raw.extend([(seq, sample_json(sample)) for seq, sample in zip(seqs, samples)])
+        with self._lock:
+            views = list(self._views.values())
+        pending = False
+        for decimator, batcher, log, _ in views:
+            if batcher is None:
+                log.extend(decimator.add(samples, seqs))
+                continue
+            if decimator:
+                log.extend(batcher.add(*decimator.keep(samples, seqs)))
+            else:
+                log.extend(batcher.add(samples, seqs))
+            pending = pending or bool(batcher._pending)
+        self.pending = pending
+
+    def flush(self):
+        """
+        Send every view's pending batch and open aggregation window now,
+        for a source that has ended (the producer thread again).
+        """
+        with self._lock:
+            views = list(self._views.values())
+        for decimator, batcher, log, _ in views:
+            if batcher is not None:
+                log.extend(batcher.flush())
+            elif decimator:
+                log.extend(decimator.flush(self.raw.seq))
+        self.pending = False
+
+    def _acquire(self, key):
+        rate, agg, batch, frame = key
+        if not rate and not batch and not frame:
+            return self.raw
+        with self._lock:
+            view = self._views.get(key)
+            if view is None:
+                if frame:
+                    batcher = Batcher((batch or 0) / 1000.0, encode=FRAME_ENCODINGS[frame])
+                else:
+                    batcher = Batcher(batch / 1000.0) if batch else None
+                view = self._views[key] = [Decimator(rate, agg) if rate else None, batcher,
+                                           EventLog(self.maxlen), 0]
+            view[3] += 1
+            return view[2]
+
+    def _release(self, key):
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                view[3] -= 1
+                if view[3] == 0:
+                    del self._views[key]
+
+    def events(self, rate=None, agg='latest', batch=None, frame=None,
+               policy='drop_oldest', buffer=DEFAULT_BUFFER, last_id=None, keepalive=15.0):
+        """
+        Lists of new (id, event) pairs of one subscriber's view, as they
+        arrive ([] after keepalive seconds without any). rate=None (or 0)
+        is the full rate; batch (ms) packs samples into columnar JSON
+        events; frame ('raw' or 'zlib') asks for binary frames
+        (telemetry.pack_frame) of everything published together, or of
+        each batch window. policy and buffer bound how far behind the
+        subscriber may fall (see class doc). With last_id, the first list
+        is (id, JSON, 'replay') for the samples published after it.
+        """
+        # Further behind than the log holds, events would wrap away before the policy saw them
+        buffer = min(buffer, self.maxlen)
+        key = (rate or None, agg if rate else 'latest', batch or None, frame)
+        log = self._acquire(key)
+        client = {'view': _view_label(key), 'policy': policy, 'buffer': buffer,
+                  'connected': time.time(), 'sent': 0, 'dropped': 0}
+        with self._lock:
+            client_id = next(self._ids)
+            self._subscribers[client_id] = client
+        try:
+            seq = log.seq
+            if last_id is not None:
+                replay = self._replay(last_id)
+                if replay is not None:
+                    client['sent'] += 1
+                    yield [replay]
+                    # Live events the replay already covered
+                    last_id = replay[0]
+                else:
+                    last_id = None
+            while True:
+                seq, events, lost = log.since(seq, timeout=keepalive)
+                if last_id is not None and events:
+                    events = [event for event in events if event[0] is None or event[0] > last_id]
+                    last_id = None
+                behind = lost + len(events)
+                if behind > buffer:
+                    if policy == 'disconnect':
+                        with self._lock:
+                            self.disconnected += 1
+                        return
+                    events = events[-1:] if policy == 'latest' else events[-buffer:]
+                dropped = behind - len(events)
+                if dropped:
+                    client['dropped'] += dropped
+                    with self._lock:
+                        self.dropped[policy] += dropped
+                client['sent'] += len(events)
+                yield events
+        finally:
+            with self._lock:
+                del self._subscribers[client_id]
+            self._release(key)
+
+    def _replay(self, last_id):
+        """(id, columnar JSON, 'replay') of the retained samples after last_id, or None."""
+        if not 0 <= last_id < self.raw.seq:
+            # Nothing missed
+            return None
+        seq, samples, lost = self.recent.since(last_id, timeout=0)
+        if not samples:
+            return None
+        return seq, batch_json(samples, lost), 'replay'
+
+    def stream(self, keepalive=15.0, last_id=None, **view):
+        """
+        SSE text for one subscriber (events() arguments), every wake-up
+        sent as one write. last_id is the client's Last-Event-ID header,
+        if any; ids of another epoch, or that it cannot parse, are ignored.
+        Events without an id (see Decimator.add) keep the client's last one.
+        """
+        epoch, _, seq = (last_id or '').partition('-')
+        last_id = int(seq) if epoch == self.epoch and seq.isdigit() else None
+        for events in self.events(keepalive=keepalive, last_id=last_id, **view):
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            yield ''.join(self._sse(event) for event in events)
+
+    def _sse(self, event):
+        text = f"event: {event[2]}\n" if len(event) > 2 else ''
+        if event[0] is not None:
+            text += f"id: {self.epoch}-{event[0]}\n"
+        return f"{text}data: {event[1]}\n\n"
+
+    def views(self):
+        """{'rate/agg[/batch ms][/frame]': subscriber count} of the views in use."""
+        with self._lock:
+            return {_view_label(key): view[3] for key, view in self._views.items()}
+
+    def stats(self):
+        """Backpressure counters: totals per policy and every connected subscriber."""
+        with self._lock:
+            return {'samples': self.raw.seq, 'dropped': dict(self.dropped),
+                    'disconnected': self.disconnected,
+                    'subscribers': [dict(client, id=client_id)
+                                    for client_id, client in self._subscribers.items()]}
+
+def _view_label(key):
+    rate, agg, batch, frame = key
+    return f"{rate or 0:g}/{agg}" + (f"/{batch:g}ms" if batch else '') + (f"/{frame}" if frame else '')
+
+def parse_view_args(args, default_rate=None, default_agg='latest', default_policy='drop_oldest',
+                    max_buffer=LOG_EVENTS):
+    """
+    Broadcaster.events() keyword arguments from request query arguments
+    ?rate=30&agg=mean, ?batch=20 and ?policy=latest&buffer=64. rate=0
+    asks for the full-rate stream; batch is a window in ms for columnar
+    micro-batches (raw or latest samples only); buffer is how many events
+    the client may fall behind before its policy applies, at most
+    max_buffer (the Broadcaster's maxlen). Raises ValueError on bad values.
+    """
+    rate = default_rate
+    if 'rate' in args:
+        try:
+            rate = float(args['rate'])
+        except ValueError:
+            raise ValueError("rate must be a number (events per second)")
+    agg = args.get('agg', default_agg)
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"agg must be one of {', '.join(AGGREGATIONS)}")
+    if rate is not None and not 0 <= rate <= MAX_RATE:
+        raise ValueError(f"rate must be between 0 and {MAX_RATE:g}")
+    batch = None
+    if 'batch' in args:
+        try:
+            batch = float(args['batch'])
+        except ValueError:
+            raise ValueError("batch must be a number (milliseconds)")
+        if not 0 <= batch <= MAX_BATCH_MS:
+            raise ValueError(f"batch must be between 0 and {MAX_BATCH_MS:g} ms")
+        if batch and rate and agg != 'latest':
+            raise ValueError("batch only applies to raw or agg=latest streams")
+    policy = args.get('policy', default_policy)
+    if policy not in POLICIES:
+        raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+    try:
+        buffer = int(args.get('buffer', DEFAULT_BUFFER))
+    except ValueError:
+        raise ValueError("buffer must be a whole number of events")
+    if not 1 <= buffer <= max_buffer:
+        raise ValueError(f"buffer must be between 1 and {max_buffer}")
+    return {'rate': rate or None, 'agg': agg, 'batch': batch or None, 'policy': policy, 'buffer': buffer}
+
+def add_websocket_route(app, broadcaster, path='/ws', default_rate=None):
+    """
+    Serve binary frames (see telemetry.FRAME_HEADER) over a WebSocket at
+    path, fed by the same broadcaster as SSE. Takes the SSE query
+    arguments plus ?zlib=1 for zlib-compressed frames. Needs flask-sock.
+    """
+    from flask import request
+    from flask_sock import Sock
+    sock = Sock(app)
+
+    @sock.route(path)
+    def websocket(ws):
+        try:
+            view = parse_view_args(request.args, default_rate)
+            if view['rate'] and view['agg'] != 'latest':
+                raise ValueError("binary frames carry samples: use agg=latest")
+        except ValueError as e:
+            ws.close(reason=1008, message=str(e))
+            return
+        frame = 'zlib' if request.args.get('zlib') in ('1', 'true') else 'raw'
+        events = broadcaster.events(frame=frame, **view)
+        try:
+            for frames in events:
+                for _, data in frames:
+                    ws.send(data)
+        finally:
+            events.close()
+    return sock
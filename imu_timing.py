@@ -0,0 +1,174 @@
+import threading
+import time
+import numpy as np
+
+NSEC_PER_SEC = 1_000_000_000
+
+class TimingAnalyzer:
+    """
+    Streaming analysis of sample timestamps (int64 nanoseconds).
+    Feed chunks in arrival order with update(); memory stays constant no
+    matter how long the log is. Interval percentiles come from a fixed
+    log-spaced histogram, not from stored samples: each is the mean of the
+    intervals in its bin, so it is exact when they are all equal and
+    otherwise within the bin width (report()['bin_resolution_pct']).
+    """
+
+    def __init__(self, nominal_hz=None, gap_factor=3.0, min_interval_s=1e-6,
+                 max_interval_s=10.0, bins_per_decade=200, max_gaps=1000):
+        self.nominal_hz = nominal_hz
+        self.gap_factor = gap_factor
+        self.max_gaps = max_gaps
+
+        decades = np.log10(max_interval_s) - np.log10(min_interval_s)
+        self.edges_ns = np.logspace(np.log10(min_interval_s * NSEC_PER_SEC),
+                                    np.log10(max_interval_s * NSEC_PER_SEC),
+                                    int(decades * bins_per_decade) + 1)
+        self.bin_resolution = 10 ** (1 / bins_per_decade) - 1
+        self.reset()
+
+    def reset(self):
+        """Forget everything seen so far."""
+        # counts[0] is below the first edge, counts[-1] above the last
+        self.counts = np.zeros(len(self.edges_ns) + 1, dtype=np.int64)
+        self.sums_ns = np.zeros(len(self.edges_ns) + 1)
+        self.min_interval_ns = None
+        self.max_interval_ns = None
+        self.n_samples = 0
+        self.first_ns = None
+        self.last_ns = None
+        self.duplicates = 0
+        self.backwards = 0
+        self.gaps = []
+        self.n_gaps = 0
+        self.gap_time_ns = 0
+        self._period_ns = None if self.nominal_hz is None else NSEC_PER_SEC / self.nominal_hz
+
+    def update(self, stamps_ns):
+        """Add a chunk of timestamps (continuing from the previous chunk)."""
+        stamps = np.asarray(stamps_ns, dtype=np.int64)
+        if stamps.size == 0:
+            return
+        if self.first_ns is None:
+            self.first_ns = int(stamps[0])
+            prev = stamps
+        else:
+            prev = np.concatenate(([self.last_ns], stamps))
+        self.n_samples += stamps.size
+        self.last_ns = int(stamps[-1])
+
+        dt = np.diff(prev)
+        if dt.size == 0:
+            return
+
+        self.duplicates += int(np.count_nonzero(dt == 0))
+        self.backwards += int(np.count_nonzero(dt < 0))
+        forward = dt[dt > 0]
+        bins = np.searchsorted(self.edges_ns, forward, side='right')
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+        self.sums_ns += np.bincount(bins, weights=forward, minlength=len(self.counts))
+        if forward.size:
+            lo, hi = int(forward.min()), int(forward.max())
+            self.min_interval_ns = lo if self.min_interval_ns is None else min(self.min_interval_ns, lo)
+            self.max_interval_ns = hi if self.max_interval_ns is None else max(self.max_interval_ns, hi)
+
+        # Without a nominal rate, lock the period onto the median of the first chunk
+        if self._period_ns is None and forward.size:
+            self._period_ns = float(np.median(forward))
+        if self._period_ns is None:
+            return
+
+        gap_idx = np.flatnonzero(dt > self.gap_factor * self._period_ns)
+        if gap_idx.size:
+            self.n_gaps += gap_idx.size
+            self.gap_time_ns += int(dt[gap_idx].sum())
+            room = self.max_gaps - len(self.gaps)
+            for i in gap_idx[:max(room, 0)]:
+                self.gaps.append((int(prev[i]), int(prev[i + 1])))
+
+    def percentile_ns(self, q):
+        """
+        Interval percentile (q in 0-100): the mean interval of the bin it
+        falls in, kept within the exact observed min and max.
+        """
+        total = self.counts.sum()
+        if total == 0:
+            return float('nan')
+        cum = np.cumsum(self.counts)
+        b = min(int(np.searchsorted(cum, q / 100 * total, side='left')), len(cum) - 1)
+        value = self.sums_ns[b] / self.counts[b]
+        return float(min(max(value, self.min_interval_ns), self.max_interval_ns))
+
+    def rate_histogram(self, min_count=1):
+        """Non-empty interval bins as (rate_hz lower edge, rate_hz upper edge, count)."""
+        rows = []
+        for b in np.flatnonzero(self.counts >= min_count):
+            if 0 < b < len(self.edges_ns):
+                rows.append((float(NSEC_PER_SEC / self.edges_ns[b]),
+                             float(NSEC_PER_SEC / self.edges_ns[b - 1]), int(self.counts[b])))
+        return rows
+
+    def report(self):
+        """Summary dict: rate, interval percentiles, jitter, gaps and duplicates."""
+        duration_s = 0.0 if self.first_ns is None else (self.last_ns - self.first_ns) / NSEC_PER_SEC
+        pct = {f"p{q:g}": self.percentile_ns(q) for q in (0.1, 1, 50, 99, 99.9)}
+        median = pct['p50']
+        return {
+            'samples': self.n_samples,
+            'duration_s': duration_s,
+            'mean_rate_hz': (self.n_samples - 1) / duration_s if duration_s > 0 else float('nan'),
+            'median_rate_hz': NSEC_PER_SEC / median if median == median else float('nan'),
+            'interval_ms': {k: v / 1e6 for k, v in pct.items()},
+            'bin_resolution_pct': 100 * self.bin_resolution,
+            'jitter_ms': {
+                'p1_to_p99': (pct['p99'] - pct['p1']) / 1e6,
+                'p0.1_to_p99.9': (pct['p99.9'] - pct['p0.1']) / 1e6,
+            },
+            'gaps': self.n_gaps,
+            'gap_time_s': self.gap_time_ns / NSEC_PER_SEC,
+            'gap_intervals': [(a / NSEC_PER_SEC, b / NSEC_PER_SEC) for a, b in self.gaps],
+            'duplicates': self.duplicates,
+            'backwards': self.backwards,
+        }
+
+class LiveTimingMonitor(TimingAnalyzer):
+    """
+    TimingAnalyzer fed one arrival at a time from a reader thread.
+    Arrivals are buffered and analysed in batches, so tick() is cheap.
+    """
+
+    def __init__(self, batch=256, **kwargs):
+        # reset() (called by TimingAnalyzer.__init__) takes the lock
+        self._lock = threading.Lock()
+        self._buf = np.empty(batch, dtype=np.int64)
+        self._n = 0
+        super().__init__(**kwargs)
+
+    def tick(self, t_ns=None):
+        """Record one arrival (defaults to now, monotonic clock)."""
+        with self._lock:
+            self._buf[self._n] = time.monotonic_ns() if t_ns is None else t_ns
+            self._n += 1
+            if self._n == len(self._buf):
+                self._flush()
+
+    def extend(self, stamps_ns):
+        """Record a batch of arrival times (int64 ns, in order) at once."""
+        with self._lock:
+            self._flush()
+            TimingAnalyzer.update(self, stamps_ns)
+
+    def _flush(self):
+        if self._n:
+            TimingAnalyzer.update(self, self._buf[:self._n])
+            self._n = 0
+
+    def report(self):
+        with self._lock:
+            self._flush()
+            return TimingAnalyzer.report(self)
+
+    def reset(self):
+        with self._lock:
+            self._n = 0
+            TimingAnalyzer.reset(self)
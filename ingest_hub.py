@@ -0,0 +1,160 @@
+import argparse
+import json
+import selectors
+import threading
+import time
+from flask import Flask, Response, jsonify, request
+
+from serial_sources import LineReader, open_source
+from telemetry import parse_line
+from broadcast import Broadcaster, parse_view_args
+
+class IngestHub:
+    """
+    Reads any number of serial sources from one thread.
+    All devices share one selector: a wake-up reads every ready device in
+    a single batch, parses its lines into Samples tagged with the device
+    id and publishes them to that device's broadcaster and the merged one.
+    """
+
+    def __init__(self, sources, maxlen=4096):
+        self.readers = {device: LineReader(source) for device, source in sources.items()}
+        self.streams = {device: Broadcaster(maxlen) for device in sources}
+        self.merged = Broadcaster(maxlen * max(len(sources), 1))
+        self.dropped = dict.fromkeys(sources, 0)
+        self._selector = selectors.DefaultSelector()
+        for device, reader in self.readers.items():
+            self._selector.register(reader.source, selectors.EVENT_READ, device)
+        self._thread = None
+
+    def run(self, stop_after=None):
+        """Ingest until every source has closed (or stop_after seconds)."""
+        deadline = None if stop_after is None else time.monotonic() + stop_after
+        batching = set()   # devices whose streams have a batch window open
+        while self._selector.get_map():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            merged = []
+            ready = set()
+            for key, _ in self._selector.select(timeout=1.0):
+                device = key.data
+                reader = self.readers[device]
+                records = []
+                lines, t, _ = reader.stamped_lines(wait=False)
+                for line, line_t in zip(lines, t):
+                    sample = parse_line(line, device, line_t)
+                    if sample is None:
+                        self.dropped[device] += 1
+                    else:
+                        records.append(sample)
+                stream = self.streams[device]
+                stream.publish(records)
+                ready.add(device)
+                merged.extend(records)
+                if not reader.source.is_open:
+                    self._selector.unregister(reader.source)
+                    stream.flush()
+                if stream.pending:
+                    batching.add(device)
+                else:
+                    batching.discard(device)
+            # Idle devices with a batch window open still publish, so it goes out when due
+            for device in batching - ready:
+                stream = self.streams[device]
+                stream.publish([])
+                if not stream.pending:
+                    batching.discard(device)
+            self.merged.publish(merged)
+        for stream in self.streams.values():
+            stream.flush()
+        self.merged.flush()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        for reader in self.readers.values():
+            reader.close()
+
+    def status(self):
+        return {device: {'samples': self.streams[device].raw.seq, 'dropped_lines': self.dropped[device],
+                         'open': reader.source.is_open, 'views': self.streams[device].views()}
+                for device, reader in self.readers.items()}
+
+app = Flask(__name__)
+hub = None
+
+@app.route('/devices')
+def devices():
+    return jsonify(hub.status())
+
+@app.route('/stats')
+def stats():
+    """Backpressure counters of the merged stream and of each device's"""
+    return jsonify({'merged': hub.merged.stats(),
+                    **{device: broadcaster.stats() for device, broadcaster in hub.streams.items()}})
+
+def _stream_response(broadcaster):
+    """SSE response for the broadcast.parse_view_args query arguments (full rate by default)"""
+    try:
+        view = parse_view_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    events = broadcaster.stream(last_id=request.headers.get('Last-Event-ID'), **view)
+    return Response(events, mimetype="text/event-stream")
+
+@app.route('/stream')
+def merged_stream():
+    """All devices interleaved in arrival order (decimated per device)"""
+    return _stream_response(hub.merged)
+
+@app.route('/stream/<device>')
+def device_stream(device):
+    """One device's samples"""
+    if device not in hub.streams:
+        return jsonify({'error': f"unknown device {device}", 'devices': list(hub.streams)}), 404
+    return _stream_response(hub.streams[device])
+
+def parse_devices(specs):
+    """['front=/dev/ttyACM0', 'tcp://host:2000'] -> {'front': spec, 'dev1': spec}"""
+    devices = {}
+    for i, spec in enumerate(specs):
+        name, sep, source = spec.partition('=')
+        if not sep or '/' in name or ':' in name:
+            name, source = f'dev{i}', spec
+        devices[name] = source
+    return devices
+
+def main():
+    global hub
+    parser = argparse.ArgumentParser(description="Ingest several Arduinos in one process and serve SSE streams")
+    parser.add_argument('devices', nargs='+', metavar='[NAME=]SOURCE',
+                        help="Device sources (see serial_sources.open_source), e.g. front=/dev/ttyACM0 "
+                             "rear=tcp://10.0.0.5:2000 bench=replay:gyro.csv,accel.csv?speed=0")
+    parser.add_argument('--port', type=int, default=8080, help="HTTP port")
+    parser.add_argument('--bench', type=float, metavar='SECONDS',
+                        help="Only ingest for this long, then print throughput and CPU time")
+    args = parser.parse_args()
+
+    sources = {name: open_source(spec) for name, spec in parse_devices(args.devices).items()}
+    hub = IngestHub(sources)
+
+    if args.bench:
+        wall, cpu = time.monotonic(), time.process_time()
+        hub.run(stop_after=args.bench)
+        wall, cpu = time.monotonic() - wall, time.process_time() - cpu
+        total = hub.merged.raw.seq
+        print(json.dumps(hub.status(), indent=2))
+        print(f"✅ {len(sources)} devices, {total} samples in {wall:.2f} s "
+              f"({total / wall:,.0f} samples/s, CPU {cpu:.2f} s = {1e6 * cpu / max(total, 1):.1f} µs/sample)")
+        hub.close()
+        return
+
+    hub.start()
+    print(f"📡 Ingesting {', '.join(hub.readers)}")
+    app.run(debug=False, threaded=True, host='0.0.0.0', port=args.port)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import numpy as np
+from matplotlib.colors import to_rgb
+
+def _next(a):
+    """a rotated by one: the end point of each polygon edge."""
+    return np.concatenate((a[1:], a[:1]))
+
+class RasterCarRenderer:
+    """
+    Pure NumPy renderer for the CarVisualizer mesh.
+    Projects vertices with the same default camera as mplot3d (elev=30,
+    azim=-60, box aspect 4:4:3, orthographic), sorts faces back to front
+    (painter's algorithm) and fills them into an RGB image buffer. The
+    static ground plane is composited onto the background once.
+    """
+
+    def __init__(self, width=480, height=400, elev=30, azim=-60,
+                 limits=((-3, 3), (-3, 3), (-1, 3)), box_aspect=(4, 4, 3),
+                 background=(255, 255, 255), margin=0.05):
+        self.width = width
+        self.height = height
+        self.background = np.array(background, dtype=np.uint8)
+
+        lo = np.array([l[0] for l in limits], dtype=float)
+        hi = np.array([l[1] for l in limits], dtype=float)
+        aspect = np.asarray(box_aspect, dtype=float) / max(box_aspect)
+        # World -> normalized box -> camera axes, as one affine map
+        self._scale = aspect / (hi - lo)
+        self._offset = -(lo + hi) / 2 * self._scale
+
+        e, a = np.radians(elev), np.radians(azim)
+        self._view = np.array([
+            [-np.sin(a), np.cos(a), 0.0],                                   # screen right
+            [-np.sin(e) * np.cos(a), -np.sin(e) * np.sin(a), np.cos(e)],    # screen up
+            [np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)],      # towards the eye
+        ])
+
+        # Fit the projected axis box into the image
+        corners = np.array(np.meshgrid(*limits)).T.reshape(-1, 3)
+        screen = self._camera(corners)[:, :2]
+        smin, smax = screen.min(axis=0), screen.max(axis=0)
+        self._px_per_unit = (1 - 2 * margin) * min(width / (smax[0] - smin[0]),
+                                                   height / (smax[1] - smin[1]))
+        self._center = (smin + smax) / 2
+
+        # The ground never moves: blend it in once, copy it per frame
+        self._ground = self.new_image()
+        g = np.array([[lo[0], lo[1], 0], [hi[0], lo[1], 0], [hi[0], hi[1], 0], [lo[0], hi[1], 0]])
+        gx, gy, _ = self.project(g)
+        self.fill_polygon(self._ground, gx, gy, (128, 128, 128), alpha=0.3)
+
+    def _camera(self, points):
+        """World points (..., 3) -> camera coordinates (right, up, depth)."""
+        return (np.asarray(points) * self._scale + self._offset) @ self._view.T
+
+    def project(self, points):
+        """World points (..., 3) -> pixel x, pixel y and depth (larger = nearer)."""
+        cam = self._camera(points)
+        px = (cam[..., 0] - self._center[0]) * self._px_per_unit + self.width / 2
+        py = self.height / 2 - (cam[..., 1] - self._center[1]) * self._px_per_unit
+        return px, py, cam[..., 2]
+
+    def pixels_per_unit(self):
+        """Image pixels per world unit in the ground (x/y) plane, for sphere radii."""
+        return self._px_per_unit * np.sqrt(self._scale[0] * self._scale[1])
+
+    def new_image(self, ground=False):
+        if ground:
+            return self._ground.copy()
+        return np.broadcast_to(self.background, (self.height, self.width, 3)).copy()
+
+    def spans(self, xs, ys):
+        """
+        Scanline spans of a polygon (even-odd rule, pixel centers), clipped
+        to the image: (rows, first columns, end columns), or None if empty.
+        """
+        y0 = max(int(np.floor(ys.min())), 0)
+        y1 = min(int(np.ceil(ys.max())) + 1, self.height)
+        if y0 >= y1:
+            return None
+        rows = np.arange(y0, y1)
+        py = rows[:, None] + 0.5
+        xb, yb = _next(xs), _next(ys)
+        # Where every edge crosses every row center (inf where it does not)
+        crosses = (ys > py) != (yb > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xc = np.where(crosses, (xb - xs) * (py - ys) / (yb - ys) + xs, np.inf)
+        xc.sort(axis=1)
+        pairs = xc.shape[1] // 2
+        starts, ends = xc[:, 0:2 * pairs:2], xc[:, 1:2 * pairs:2]
+        valid = np.isfinite(ends)
+        first = np.clip(np.ceil(starts[valid] - 0.5), 0, self.width).astype(int)
+        end = np.clip(np.ceil(ends[valid] - 0.5), 0, self.width).astype(int)
+        keep = end > first
+        if not keep.any():
+            return None
+        return np.broadcast_to(rows[:, None], valid.shape)[valid][keep], first[keep], end[keep]
+
+    def fill_polygon(self, img, xs, ys, color, alpha=1.0):
+        """Fill one polygon (even-odd rule) into img, alpha-blended, from its scanline spans."""
+        spans = self.spans(xs, ys)
+        if spans is None:
+            return
+        rows, first, end = spans
+        # Flat pixel index of every pixel of every span
+        lengths = end - first
+        offsets = np.repeat(rows * self.width + first - (np.cumsum(lengths) - lengths), lengths)
+        pixels = img.reshape(-1, 3)
+        index = offsets + np.arange(len(offsets))
+        if alpha >= 1.0:
+            pixels[index] = color
+        else:
+            pixels[index] = self._blend(pixels[index], color, alpha)
+
+    def _blend(self, values, color, alpha):
+        """uint8 (N, 3) values blended towards color, in 8-bit fixed point."""
+        weight = int(round(alpha * 256))
+        blended = values.astype(np.uint16)
+        blended *= 256 - weight
+        blended += (np.asarray(color) * weight).astype(np.uint16)
+        blended >>= 8
+        return blended.astype(np.uint8)
+
+    def draw_outline(self, img, xs, ys, color=(0, 0, 0)):
+        """Draw the polygon edges one pixel wide."""
+        xb, yb = _next(xs), _next(ys)
+        n = np.maximum(np.abs(xb - xs), np.abs(ys - yb)).astype(int) + 1
+        # Position of every point along its own edge, all edges at once
+        step = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        frac = step / np.repeat(np.maximum(n - 1, 1), n)
+        x = (np.repeat(xs, n) + frac * np.repeat(xb - xs, n)).astype(int)
+        y = (np.repeat(ys, n) + frac * np.repeat(yb - ys, n)).astype(int)
+        ok = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        img[y[ok], x[ok]] = color
+
+    def fill_disc(self, img, cx, cy, radius, color, alpha=1.0):
+        """Fill a projected sphere (a disc) into img."""
+        x0, x1 = max(int(cx - radius), 0), min(int(cx + radius) + 2, self.width)
+        y0, y1 = max(int(cy - radius), 0), min(int(cy + radius) + 2, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        px = np.arange(x0, x1) + 0.5
+        py = (np.arange(y0, y1) + 0.5)[:, None]
+        inside = (px - cx) ** 2 + (py - cy) ** 2 <= radius ** 2
+        region = img[y0:y1, x0:x1]
+        region[inside] = self._blend(region[inside], color, alpha)
+
+    def render(self, vertices, faces, color='blue', alpha=0.8, wheels=(), wheel_radius=0.3,
+               wheel_color='black', wheel_alpha=0.7, ground=True):
+        """
+        Render one car pose.
+
+        Args:
+            vertices (ndarray): (V, 3) rotated car vertices
+            faces (list): Vertex index lists of the body faces
+            color: Body face color (any matplotlib color)
+            wheels (iterable): Vertex indices of wheel centers, drawn as spheres
+
+        Returns:
+            ndarray: (height, width, 3) uint8 image
+        """
+        img = self.new_image(ground)
+
+        px, py, depth = self.project(vertices)
+        body_rgb = tuple(int(255 * c) for c in to_rgb(color))
+        wheel_rgb = tuple(int(255 * c) for c in to_rgb(wheel_color))
+
+        # (depth, kind, payload): faces and wheels sorted together, far first
+        items = [(depth[face].mean(), 0, face) for face in faces]
+        items += [(depth[w], 1, w) for w in wheels]
+        for _, kind, payload in sorted(items, key=lambda item: item[0]):
+            if kind == 0:
+                xs, ys = px[payload], py[payload]
+                self.fill_polygon(img, xs, ys, body_rgb, alpha)
+                self.draw_outline(img, xs, ys)
+            else:
+                self.fill_disc(img, px[payload], py[payload], wheel_radius * self.pixels_per_unit(),
+                               wheel_rgb, wheel_alpha)
+        return img
@@ -1,27 +1,112 @@
+import os
+import shutil
+import hashlib
+import itertools
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from mpl_toolkits.mplot3d import Axes3D
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import matplotlib.animation as animation
 from scipy.spatial.transform import Rotation
+from PIL import Image, ImageDraw
+from car_raster import RasterCarRenderer
+from report import CACHE_DIR, cached_paths, prune_cache, tile_images
 import warnings
 warnings.filterwarnings('ignore')
 
+# Car color and alert text per crash event type (None = unknown type)
+EVENT_STYLES = {
+    'sudden_rotation': ('red', '🚨 SUDDEN ROTATION DETECTED!'),
+    'extreme_orientation': ('purple', '🚨 EXTREME ORIENTATION DETECTED!'),
+    None: ('orange', '🚨 CRASH EVENT DETECTED!'),
+}
+
+# Car model vertices that are wheel centers, and the wheel sphere mesh
+WHEEL_CENTERS = (16, 17, 18, 19)
+WHEEL_RADIUS = 0.3
+WHEEL_RESOLUTION = 8
+
+# Bump when thumbnail rendering changes so stale cached thumbnails are not reused
+THUMBNAIL_VERSION = 1
+
+# The Pillow GIF fallback holds every frame in memory until it saves
+MAX_PILLOW_FRAMES = 1500
+
+class CrashEventIndex:
+    """
+    Crash events as sorted start/end arrays for fast time lookup.
+    Point events have start == end; frame_events() resolves every frame
+    time with searchsorted once, so annotation is O(1) per frame.
+    """
+    
+    def __init__(self, events):
+        self.events = sorted(events, key=lambda e: e['time'])
+        self.start = np.array([e['time'] for e in self.events], dtype=float)
+        self.end = np.array([e.get('end_time', e['time']) for e in self.events], dtype=float)
+        self.types = [e['type'] for e in self.events]
+    
+    def __len__(self):
+        return len(self.events)
+    
+    def frame_events(self, times, tolerance=0.1):
+        """
+        For each time, the index of the first (earliest) event within
+        tolerance of it, or -1. Equivalent to scanning the sorted event list
+        per time with abs(event_time - time) < tolerance.
+        """
+        times = np.asarray(times, dtype=float)
+        order = np.argsort(times, kind='stable')
+        sorted_times = times[order]
+        
+        # Candidate frame ranges, one sample wider than needed; the exact
+        # distance test below then decides the float boundary cases
+        lo = np.maximum(np.searchsorted(sorted_times, self.start - tolerance, side='left') - 1, 0)
+        hi = np.searchsorted(sorted_times, self.end + tolerance, side='right') + 1
+        
+        # Later events first so the earliest covering event wins
+        labels = np.full(len(times), -1, dtype=int)
+        for i in np.flatnonzero(hi > lo)[::-1]:
+            window = sorted_times[lo[i]:hi[i]]
+            close = np.maximum(self.start[i] - window, window - self.end[i]) < tolerance
+            labels[lo[i]:hi[i]][close] = i
+        
+        result = np.empty_like(labels)
+        result[order] = labels
+        return result
+    
+    def frame_types(self, times, tolerance=0.1):
+        """Event type per time (None where no event is close)."""
+        return [self.types[i] if i >= 0 else None for i in self.frame_events(times, tolerance)]
+
 class CarVisualizer:
     def __init__(self, gyro_file='gyro_processed.csv', accel_file='accel_processed.csv'):
         """Initialize the car visualizer with sensor data files."""
+        self.gyro_file = gyro_file
+        self.accel_file = accel_file
         self.gyro_data = pd.read_csv(gyro_file)
         self.accel_data = pd.read_csv(accel_file)
+        self._data_hash = None
         
         # Calculate orientation over time
         self.orientation_data = self._calculate_orientation()
         
         # Detect crash events
         self.crash_events = self._detect_crash_events()
+        self.event_index = CrashEventIndex(self.crash_events)
         
-        # Create car model
-        self.car_vertices, self.car_faces = self._create_car_model()
+        # Create car model: body and wheel meshes merged into one vertex/face
+        # buffer, so a pose is one rotation and one polygon collection
+        self.car_vertices, self.car_faces, self.wheel_faces = self._create_car_model()
+        self.body_faces = self.car_faces[~self.wheel_faces]
+        self._wheel_rgba = to_rgba('black', 0.7)
+        self._edge_colors = np.where(self.wheel_faces[:, None], (0, 0, 0, 0), to_rgba('black'))
         
     def _calculate_orientation(self):
         """Calculate cumulative orientation from gyroscope data."""
@@ -61,24 +146,67 @@ class CarVisualizer:
                 'index': peak
             })
         
-        # Detect extreme orientation changes
-        roll_threshold = np.pi/2  # 90 degrees
-        pitch_threshold = np.pi/2
-        
-        for i, (roll, pitch) in enumerate(zip(self.orientation_data['roll'], self.orientation_data['pitch'])):
-            if abs(roll) > roll_threshold or abs(pitch) > pitch_threshold:
-                events.append({
-                    'time': self.orientation_data['time'][i],
-                    'type': 'extreme_orientation',
-                    'roll': roll,
-                    'pitch': pitch,
-                    'index': i
-                })
+        # Detect extreme orientation changes: one interval per contiguous run
+        self.extreme_segments = self._detect_extreme_orientation()
+        seg = self.extreme_segments
+        for i in range(len(seg['start_index'])):
+            events.append({
+                'time': seg['start_time'][i],
+                'end_time': seg['end_time'][i],
+                'type': 'extreme_orientation',
+                'roll': seg['peak_roll'][i],
+                'pitch': seg['peak_pitch'][i],
+                'index': seg['start_index'][i],
+                'end_index': seg['end_index'][i],
+            })
         
         return sorted(events, key=lambda x: x['time'])
     
+    def _detect_extreme_orientation(self, roll_threshold=np.pi/2, pitch_threshold=np.pi/2):
+        """
+        Find contiguous runs where |roll| or |pitch| exceeds 90 degrees.
+
+        Returns:
+            dict: Columnar arrays, one entry per run: start_index/end_index
+                  (inclusive), start_time/end_time, and the signed peak_roll /
+                  peak_pitch reached during the run
+        """
+        roll = np.asarray(self.orientation_data['roll'], dtype=float)
+        pitch = np.asarray(self.orientation_data['pitch'], dtype=float)
+        time = np.asarray(self.orientation_data['time'], dtype=float)
+        
+        extreme = (np.abs(roll) > roll_threshold) | (np.abs(pitch) > pitch_threshold)
+        edges = np.diff(np.concatenate(([0], extreme.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        
+        def signed_peak(values):
+            # Largest magnitude per run, keeping its sign
+            if len(starts) == 0:
+                return np.empty(0)
+            runs = values[extreme]
+            offsets = np.concatenate(([0], np.cumsum(ends - starts + 1)[:-1]))
+            hi = np.maximum.reduceat(runs, offsets)
+            lo = np.minimum.reduceat(runs, offsets)
+            return np.where(hi >= -lo, hi, lo)
+        
+        return {
+            'start_index': starts,
+            'end_index': ends,
+            'start_time': time[starts],
+            'end_time': time[ends],
+            'peak_roll': signed_peak(roll),
+            'peak_pitch': signed_peak(pitch),
+        }
+    
     def _create_car_model(self):
-        """Create a simple 3D car model."""
+        """
+        Create a simple 3D car model.
+        
+        Returns:
+            tuple: (vertices (V, 3), quad faces (F, 4) int array,
+                    boolean mask of the faces that belong to wheels)
+        """
         # Car dimensions
         length, width, height = 4, 2, 1.5
         
@@ -141,59 +269,69 @@ class CarVisualizer:
             [16, 17, 18, 19],  # front wheels
         ]
         
+        # Wheels as spheres around the wheel centers, appended to the same buffers
+        wheel_vertices, wheel_faces = self._wheel_mesh(vertices[list(WHEEL_CENTERS)], len(vertices))
+        vertices = np.concatenate([vertices, wheel_vertices])
+        is_wheel = np.concatenate([np.zeros(len(faces), dtype=bool), np.ones(len(wheel_faces), dtype=bool)])
+        faces = np.concatenate([np.array(faces), wheel_faces])
+        
+        return vertices, faces, is_wheel
+    
+    def _wheel_mesh(self, centers, first_index=0, radius=WHEEL_RADIUS, resolution=WHEEL_RESOLUTION):
+        """Sphere vertices and quad faces (the grid plot_surface would draw) around each center."""
+        u = np.linspace(0, 2 * np.pi, resolution)
+        v = np.linspace(0, np.pi, resolution)
+        sphere = radius * np.stack([np.outer(np.cos(u), np.sin(v)),
+                                    np.outer(np.sin(u), np.sin(v)),
+                                    np.outer(np.ones(np.size(u)), np.cos(v))], axis=-1).reshape(-1, 3)
+        grid = np.arange(resolution * resolution).reshape(resolution, resolution)
+        quads = np.stack([grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]], axis=-1).reshape(-1, 4)
+        
+        vertices = (np.asarray(centers)[:, None, :] + sphere).reshape(-1, 3)
+        offsets = first_index + len(sphere) * np.arange(len(centers))
+        faces = (quads[None, :, :] + offsets[:, None, None]).reshape(-1, 4)
         return vertices, faces
     
+    def _nearest_samples(self, time_points):
+        """Index of the closest orientation sample for every time point (one searchsorted)."""
+        time = np.asarray(self.orientation_data['time'], dtype=float)
+        time_points = np.asarray(time_points, dtype=float)
+        if len(time) == 1:
+            return np.zeros(time_points.shape, dtype=np.intp)
+        idx = np.clip(np.searchsorted(time, time_points), 1, len(time) - 1)
+        # Step back where the previous sample is at least as close (ties go to the earlier one)
+        idx -= (time_points - time[idx - 1]) <= (time[idx] - time_points)
+        return idx
+    
     def _rotate_car(self, vertices, roll, pitch, yaw):
         """Apply rotation to car vertices."""
-        # Create rotation matrix
-        r = Rotation.from_euler('xyz', [roll, pitch, yaw])
-        rotation_matrix = r.as_matrix()
-        
-        # Apply rotation to all vertices
-        rotated_vertices = np.dot(vertices, rotation_matrix.T)
-        
-        return rotated_vertices
+        return self._rotate_car_batch(vertices, [roll], [pitch], [yaw])[0]
+    
+    def _rotate_car_batch(self, vertices, roll, pitch, yaw):
+        """
+        Rotate the car vertices for many orientations at once.
+        All rotation matrices come from one Rotation.from_euler call and
+        are applied with a single einsum, giving an (frames, vertices, 3) array.
+        """
+        angles = np.column_stack([np.asarray(roll), np.asarray(pitch), np.asarray(yaw)])
+        rotation_matrices = Rotation.from_euler('xyz', angles).as_matrix()
+        return np.einsum('nij,vj->nvi', rotation_matrices, vertices)
+    
+    def _face_colors(self, color='blue', alpha=0.8):
+        """RGBA per merged face: the body in the given color, wheels black."""
+        return np.where(self.wheel_faces[:, None], self._wheel_rgba, to_rgba(color, alpha))
+    
+    def _car_collection(self, vertices, color='blue', alpha=0.8):
+        """The whole car (body and wheels) as a single polygon collection."""
+        return Poly3DCollection(vertices[self.car_faces], facecolors=self._face_colors(color, alpha),
+                                edgecolors=self._edge_colors, linewidths=1)
     
     def _draw_car(self, ax, vertices, color='blue', alpha=0.8):
         """Draw the car model."""
-        # Create polygons for each face
-        polygons = []
-        for face in self.car_faces:
-            face_vertices = [vertices[i] for i in face]
-            polygons.append(face_vertices)
-        
-        # Create 3D polygon collection
-        poly3d = Poly3DCollection(polygons, alpha=alpha, facecolor=color, edgecolor='black')
-        ax.add_collection3d(poly3d)
-        
-        # Draw wheels as spheres
-        wheel_positions = [16, 17, 18, 19]
-        for wheel_idx in wheel_positions:
-            wheel_center = vertices[wheel_idx]
-            # Draw wheel as a small sphere
-            u = np.linspace(0, 2 * np.pi, 8)
-            v = np.linspace(0, np.pi, 8)
-            radius = 0.3
-            x = wheel_center[0] + radius * np.outer(np.cos(u), np.sin(v))
-            y = wheel_center[1] + radius * np.outer(np.sin(u), np.sin(v))
-            z = wheel_center[2] + radius * np.outer(np.ones(np.size(u)), np.cos(v))
-            ax.plot_surface(x, y, z, color='black', alpha=0.7)
+        ax.add_collection3d(self._car_collection(vertices, color, alpha))
     
-    def create_car_animation(self, start_time=None, end_time=None, interval=50):
-        """Create an animated visualization of the car moving."""
-        if start_time is None:
-            start_time = self.gyro_data['time_combined'].min()
-        if end_time is None:
-            end_time = self.gyro_data['time_combined'].max()
-        
-        # Filter data by time range
-        mask = (self.gyro_data['time_combined'] >= start_time) & (self.gyro_data['time_combined'] <= end_time)
-        orientation_filtered = {k: v[mask] for k, v in self.orientation_data.items()}
-        
-        fig = plt.figure(figsize=(12, 10))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        # Set consistent axis limits
+    def _init_scene(self, ax, title_size=None, text_size=10):
+        """Create the persistent artists of a car view once; frames only update them."""
         ax.set_xlim(-3, 3)
         ax.set_ylim(-3, 3)
         ax.set_zlim(-1, 3)
@@ -207,98 +345,265 @@ class CarVisualizer:
         ground_z = np.array([[0, 0], [0, 0]])
         ax.plot_surface(ground_x, ground_y, ground_z, alpha=0.3, color='gray')
         
+        car = self._car_collection(self.car_vertices)
+        ax.add_collection3d(car)
+        
+        return {
+            'ax': ax,
+            'car': car,
+            'alert': ax.text2D(0.02, 0.98, '', transform=ax.transAxes, fontsize=14, weight='bold'),
+            'roll': ax.text2D(0.02, 0.92, '', transform=ax.transAxes, fontsize=text_size),
+            'pitch': ax.text2D(0.02, 0.88, '', transform=ax.transAxes, fontsize=text_size),
+            'yaw': ax.text2D(0.02, 0.84, '', transform=ax.transAxes, fontsize=text_size),
+        }
+    
+    def _update_scene(self, scene, vertices, roll, pitch, yaw, event_type=None):
+        """Move the car to the given vertices and refresh the overlay text."""
+        scene['car'].set_verts(vertices[self.car_faces])
+        
+        if event_type is None:
+            color, alert = 'blue', ''
+        else:
+            color, alert = EVENT_STYLES.get(event_type, EVENT_STYLES[None])
+        scene['car'].set_facecolor(self._face_colors(color))
+        scene['alert'].set_text(alert)
+        scene['alert'].set_color(color)
+        
+        scene['roll'].set_text(f'Roll: {np.degrees(roll):.1f}°')
+        scene['pitch'].set_text(f'Pitch: {np.degrees(pitch):.1f}°')
+        scene['yaw'].set_text(f'Yaw: {np.degrees(yaw):.1f}°')
+        return [scene['car'], scene['alert'],
+                scene['roll'], scene['pitch'], scene['yaw']]
+    
+    def _frame_orientation(self, start_time=None, end_time=None, fps=None):
+        """
+        Orientation for each animation frame in a time range.
+        Without fps there is one frame per gyro sample; with fps the
+        orientation is interpolated onto a fixed output frame clock, so the
+        frame count follows the video duration rather than the sensor rate.
+        """
+        if start_time is None:
+            start_time = self.gyro_data['time_combined'].min()
+        if end_time is None:
+            end_time = self.gyro_data['time_combined'].max()
+        
+        # Filter data by time range (positional arrays so frame i is sample i)
+        mask = (self.gyro_data['time_combined'] >= start_time) & (self.gyro_data['time_combined'] <= end_time)
+        orientation_filtered = {k: np.asarray(v[mask]) for k, v in self.orientation_data.items()}
+        if fps is None or len(orientation_filtered['time']) < 2:
+            return orientation_filtered
+        
+        sample_time = orientation_filtered['time']
+        frame_time = np.arange(sample_time[0], sample_time[-1] + 0.5 / fps, 1.0 / fps)
+        frame_time = frame_time[frame_time <= sample_time[-1]]
+        resampled = {k: np.interp(frame_time, sample_time, v)
+                     for k, v in orientation_filtered.items() if k != 'time'}
+        resampled['time'] = frame_time
+        return resampled
+    
+    def _animation_frames(self, start_time=None, end_time=None, fps=None):
+        """
+        Everything needed to draw each frame, precomputed as arrays:
+        time, roll, pitch, yaw, rotated car vertices and crash event type.
+        """
+        frames = self._frame_orientation(start_time, end_time, fps)
+        frames['vertices'] = self._rotate_car_batch(self.car_vertices, frames['roll'],
+                                                    frames['pitch'], frames['yaw'])
+        frames['types'] = self.event_index.frame_types(frames['time'])
+        return frames
+    
+    def _draw_frame(self, scene, frames, frame):
+        """Update a scene from _init_scene to show one precomputed frame."""
+        scene['ax'].set_title(f'Car Motion Simulation - Time: {frames["time"][frame]:.2f}s')
+        return self._update_scene(scene, frames['vertices'][frame], frames['roll'][frame],
+                                  frames['pitch'][frame], frames['yaw'][frame], frames['types'][frame])
+    
+    def create_car_animation(self, start_time=None, end_time=None, interval=50, fps=None):
+        """
+        Create an animated visualization of the car moving.
+        Pass fps to render at a fixed output frame rate (interval is then
+        1000 / fps); otherwise every gyro sample becomes a frame.
+        """
+        # Car vertices and crash event for every frame, so a frame is just an array index
+        frames = self._animation_frames(start_time, end_time, fps)
+        if fps is not None:
+            interval = 1000.0 / fps
+        
+        fig = plt.figure(figsize=(12, 10))
+        ax = fig.add_subplot(111, projection='3d')
+        
+        # Axes, ground plane, car and labels are created once; each frame
+        # only replaces vertex arrays and text instead of ax.clear()
+        scene = self._init_scene(ax)
+        
         def animate(frame):
-            ax.clear()
-            
-            # Set consistent axis limits
-            ax.set_xlim(-3, 3)
-            ax.set_ylim(-3, 3)
-            ax.set_zlim(-1, 3)
-            ax.set_xlabel('X')
-            ax.set_ylabel('Y')
-            ax.set_zlabel('Z')
-            ax.set_title(f'Car Motion Simulation - Time: {orientation_filtered["time"][frame]:.2f}s')
-            
-            # Add ground plane
-            ax.plot_surface(ground_x, ground_y, ground_z, alpha=0.3, color='gray')
-            
-            # Get current orientation
-            roll = orientation_filtered['roll'][frame]
-            pitch = orientation_filtered['pitch'][frame]
-            yaw = orientation_filtered['yaw'][frame]
-            
-            # Rotate car
-            rotated_vertices = self._rotate_car(self.car_vertices, roll, pitch, yaw)
-            
-            # Check if this is a crash event
-            current_time = orientation_filtered['time'][frame]
-            is_crash_event = False
-            crash_type = ""
-            
-            for event in self.crash_events:
-                if abs(event['time'] - current_time) < 0.1:  # Within 0.1 seconds
-                    is_crash_event = True
-                    crash_type = event['type']
-                    break
-            
-            # Draw car with appropriate color
-            if is_crash_event:
-                if crash_type == 'sudden_rotation':
-                    color = 'red'
-                    ax.text2D(0.02, 0.98, '🚨 SUDDEN ROTATION DETECTED!', 
-                             transform=ax.transAxes, fontsize=14, color='red', weight='bold')
-                elif crash_type == 'extreme_orientation':
-                    color = 'purple'
-                    ax.text2D(0.02, 0.98, '🚨 EXTREME ORIENTATION DETECTED!', 
-                             transform=ax.transAxes, fontsize=14, color='purple', weight='bold')
-                else:
-                    color = 'orange'
-                    ax.text2D(0.02, 0.98, '🚨 CRASH EVENT DETECTED!', 
-                             transform=ax.transAxes, fontsize=14, color='orange', weight='bold')
-            else:
-                color = 'blue'
-            
-            self._draw_car(ax, rotated_vertices, color=color)
-            
-            # Add orientation info
-            ax.text2D(0.02, 0.92, f'Roll: {np.degrees(roll):.1f}°', 
-                     transform=ax.transAxes, fontsize=10)
-            ax.text2D(0.02, 0.88, f'Pitch: {np.degrees(pitch):.1f}°', 
-                     transform=ax.transAxes, fontsize=10)
-            ax.text2D(0.02, 0.84, f'Yaw: {np.degrees(yaw):.1f}°', 
-                     transform=ax.transAxes, fontsize=10)
+            return self._draw_frame(scene, frames, frame)
         
-        frames = len(orientation_filtered['time'])
-        anim = animation.FuncAnimation(fig, animate, frames=frames, interval=interval, repeat=True)
+        anim = animation.FuncAnimation(fig, animate, frames=len(frames['time']), interval=interval, repeat=True)
         
         return anim
     
-    def create_static_car_views(self, time_points=None):
-        """Create static views of the car at specific time points."""
+    def export_animation(self, path, start_time=None, end_time=None, fps=10, workers=None,
+                         dpi=100, figsize=(12, 10), chunk_size=None):
+        """
+        Export an animation by rendering frame ranges in parallel processes.
+        Each worker draws its frames headlessly to raw RGB buffers; chunks
+        are streamed in order into a single ffmpeg process (any format
+        ffmpeg writes, e.g. .mp4 or .gif). Without ffmpeg, .gif falls back
+        to Pillow, which keeps all frames in memory and so is limited to
+        MAX_PILLOW_FRAMES.
+
+        Args:
+            path (str): Output file
+            start_time, end_time (float): Time range in seconds
+            fps (float): Output frame rate (orientation is resampled to it)
+            workers (int): Process pool size (defaults to CPU count)
+            dpi (int): Render resolution
+            figsize (tuple): Figure size in inches
+            chunk_size (int): Frames per worker task
+
+        Returns:
+            int: Number of frames written
+        """
+        frames = self._animation_frames(start_time, end_time, fps)
+        n_frames = len(frames['time'])
+        if n_frames == 0:
+            return 0
+        
+        workers = workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, min(50, -(-n_frames // (workers * 4))))
+        ranges = [(a, min(a + chunk_size, n_frames)) for a in range(0, n_frames, chunk_size)]
+        
+        encoder = None
+        pil_frames = []
+        ffmpeg = shutil.which(plt.rcParams['animation.ffmpeg_path']) or shutil.which('ffmpeg')
+        if not ffmpeg:
+            if not path.endswith('.gif'):
+                raise RuntimeError(f"ffmpeg is required to write {path}")
+            if n_frames > MAX_PILLOW_FRAMES:
+                raise RuntimeError(f"{n_frames} frames is too many for the Pillow GIF writer "
+                                   f"(max {MAX_PILLOW_FRAMES}): install ffmpeg or lower fps")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker,
+                                 initargs=(self, frames, figsize, dpi)) as pool:
+            # Keep a bounded window of chunks in flight so finished frames
+            # do not pile up in memory while the encoder catches up
+            pending = deque()
+            next_range = iter(ranges)
+            for r in itertools.islice(next_range, workers * 2):
+                pending.append(pool.submit(_render_frame_range, *r))
+            
+            try:
+                while pending:
+                    (width, height), buffers = pending.popleft().result()
+                    r = next(next_range, None)
+                    if r is not None:
+                        pending.append(pool.submit(_render_frame_range, *r))
+                    
+                    if encoder is None and ffmpeg:
+                        encoder = subprocess.Popen(
+                            [ffmpeg, '-y', '-loglevel', 'error',
+                             '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+                             '-i', '-'] + (['-pix_fmt', 'yuv420p'] if not path.endswith('.gif') else []) + [path],
+                            stdin=subprocess.PIPE)
+                    
+                    for buf in buffers:
+                        if encoder is not None:
+                            encoder.stdin.write(buf)
+                        else:
+                            pil_frames.append(Image.frombytes('RGB', (width, height), buf))
+            except BaseException:
+                # Leave no half-fed ffmpeg behind, nor queued chunks for the pool to render
+                for future in pending:
+                    future.cancel()
+                if encoder is not None:
+                    encoder.kill()
+                    try:
+                        encoder.stdin.close()
+                    except OSError:
+                        pass
+                    encoder.wait()
+                raise
+        
+        if encoder is not None:
+            try:
+                encoder.stdin.close()
+            finally:
+                returncode = encoder.wait()
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg failed writing {path}")
+        elif pil_frames:
+            pil_frames[0].save(path, save_all=True, append_images=pil_frames[1:],
+                               duration=1000.0 / fps, loop=0)
+        
+        return n_frames
+    
+    def render_raster(self, vertices, color='blue', renderer=None):
+        """Draw one car pose with the NumPy renderer; returns an RGB uint8 image."""
+        renderer = renderer or RasterCarRenderer()
+        return renderer.render(vertices, self.body_faces, color=color, wheels=WHEEL_CENTERS,
+                               wheel_radius=WHEEL_RADIUS)
+    
+    def raster_frames(self, start_time=None, end_time=None, fps=None, width=480, height=400):
+        """
+        Yield (time, image) for each animation frame using the NumPy
+        renderer instead of mplot3d (same camera as the 3D views).
+        """
+        frames = self._animation_frames(start_time, end_time, fps)
+        renderer = RasterCarRenderer(width, height)
+        for i, event_type in enumerate(frames['types']):
+            color = 'blue' if event_type is None else EVENT_STYLES.get(event_type, EVENT_STYLES[None])[0]
+            yield frames['time'][i], self.render_raster(frames['vertices'][i], color, renderer)
+    
+    def create_static_car_views(self, time_points=None, renderer='mpl'):
+        """
+        Create static views of the car at specific time points.
+        renderer='raster' draws the car with the NumPy renderer into plain
+        image axes, which is much faster than mplot3d.
+        """
         if time_points is None:
             # Show car at key moments
             time_points = [1.0, 20.0, 40.0, 60.0, 84.4, 84.6]  # Key moments including crash events
         
-        fig, axes = plt.subplots(2, 3, figsize=(18, 12), subplot_kw={'projection': '3d'})
+        raster = renderer == 'raster'
+        nrows = max(-(-len(time_points) // 3), 1)
+        fig, axes = plt.subplots(nrows, 3, figsize=(18, 6 * nrows), squeeze=False,
+                                 subplot_kw=None if raster else {'projection': '3d'})
         axes = axes.flatten()
+        for ax in axes[len(time_points):]:
+            ax.set_visible(False)
+        if raster:
+            raster_renderer = RasterCarRenderer(900, 750)
+        
+        # Find closest time index for every point, then rotate all views at once
+        time_indices = self._nearest_samples(time_points)
+        rotated_views = self._rotate_car_batch(self.car_vertices,
+                                               np.asarray(self.orientation_data['roll'])[time_indices],
+                                               np.asarray(self.orientation_data['pitch'])[time_indices],
+                                               np.asarray(self.orientation_data['yaw'])[time_indices])
+        
+        view_events = self.event_index.frame_events(time_points)
         
         for i, time_point in enumerate(time_points):
             ax = axes[i]
-            
-            # Find closest time index
-            time_idx = np.argmin(np.abs(self.orientation_data['time'] - time_point))
+            time_idx = time_indices[i]
             
             # Get orientation at this time
             roll = self.orientation_data['roll'][time_idx]
             pitch = self.orientation_data['pitch'][time_idx]
             yaw = self.orientation_data['yaw'][time_idx]
             
-            # Check if this is a crash event
-            is_crash_event = False
-            for event in self.crash_events:
-                if abs(event['time'] - time_point) < 0.1:
-                    is_crash_event = True
-                    break
+            is_crash_event = view_events[i] >= 0
+            
+            if raster:
+                ax.imshow(self.render_raster(rotated_views[i], 'red' if is_crash_event else 'blue',
+                                             raster_renderer))
+                ax.set_axis_off()
+                ax.set_title(f'Time: {time_point:.1f}s' + (' 🚨 CRASH EVENT!' if is_crash_event else ''), fontsize=12)
+                for y, label, angle in ((0.95, 'Roll', roll), (0.90, 'Pitch', pitch), (0.85, 'Yaw', yaw)):
+                    ax.text(0.02, y, f'{label}: {np.degrees(angle):.1f}°', transform=ax.transAxes, fontsize=8)
+                continue
             
             # Set view
             ax.set_xlim(-3, 3)
@@ -314,8 +619,8 @@ class CarVisualizer:
             ground_z = np.array([[0, 0], [0, 0]])
             ax.plot_surface(ground_x, ground_y, ground_z, alpha=0.3, color='gray')
             
-            # Rotate and draw car
-            rotated_vertices = self._rotate_car(self.car_vertices, roll, pitch, yaw)
+            # Draw the pre-rotated car
+            rotated_vertices = rotated_views[i]
             color = 'red' if is_crash_event else 'blue'
             self._draw_car(ax, rotated_vertices, color=color)
             
@@ -336,6 +641,71 @@ class CarVisualizer:
         plt.tight_layout()
         return fig
     
+    def data_hash(self):
+        """SHA-256 of the gyro and accel files (computed once), used to key cached renders."""
+        if self._data_hash is None:
+            h = hashlib.sha256()
+            for path in (self.gyro_file, self.accel_file):
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        h.update(block)
+            self._data_hash = h.hexdigest()
+        return self._data_hash
+    
+    def render_car_thumbnails(self, time_points, output='car_contact_sheet.png', ncols=10,
+                              width=240, height=200, cache_dir=os.path.join(CACHE_DIR, 'car_views'),
+                              workers=None, chunk_size=64):
+        """
+        Render the car pose at many time points (e.g. every incident of a
+        fleet report) as captioned thumbnails, optionally tiled into one
+        contact sheet. Samples are looked up with one searchsorted and all
+        poses rotated at once; uncached thumbnails are drawn with the raster
+        renderer in worker processes. Thumbnails are cached under
+        (data file hash, time, size), so re-runs only render new incidents.
+
+        Args:
+            time_points (array-like): Times in seconds
+            output (str): Contact sheet path, or None to only write thumbnails
+            ncols (int): Thumbnails per contact sheet row
+            width, height (int): Thumbnail size in pixels
+            cache_dir (str): Thumbnail directory, pruned to report.CACHE_MAX_FILES
+            workers (int): Process pool size (defaults to CPU count)
+            chunk_size (int): Thumbnails per worker task
+
+        Returns:
+            tuple: (list of thumbnail paths in time_points order, contact sheet path or None)
+        """
+        time_points = np.asarray(time_points, dtype=float)
+        data_hash = self.data_hash()
+        keys = [hashlib.sha256(f"{THUMBNAIL_VERSION}|{data_hash}|{float(t):.9f}|{width}x{height}".encode())
+                .hexdigest() for t in time_points]
+        paths, todo = cached_paths(cache_dir, keys)
+        
+        if todo:
+            todo_idx = np.fromiter(todo.values(), dtype=int, count=len(todo))
+            sample_idx = self._nearest_samples(time_points[todo_idx])
+            roll = np.asarray(self.orientation_data['roll'])[sample_idx]
+            pitch = np.asarray(self.orientation_data['pitch'])[sample_idx]
+            yaw = np.asarray(self.orientation_data['yaw'])[sample_idx]
+            vertices = self._rotate_car_batch(self.car_vertices, roll, pitch, yaw)
+            is_crash = self.event_index.frame_events(time_points[todo_idx]) >= 0
+            
+            jobs = []
+            for j, path in enumerate(todo):
+                caption = (f"{time_points[todo_idx[j]]:.2f}s{' CRASH' if is_crash[j] else ''}  "
+                           f"R{np.degrees(roll[j]):.0f} P{np.degrees(pitch[j]):.0f} Y{np.degrees(yaw[j]):.0f}")
+                jobs.append((path, vertices[j], 'red' if is_crash[j] else 'blue', caption))
+            
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_render_thumbnails, self.body_faces, jobs[a:a + chunk_size], width, height)
+                           for a in range(0, len(jobs), chunk_size)]
+                for future in futures:
+                    future.result()
+        
+        sheet = tile_images(paths, output, ncols) if output else None
+        prune_cache(cache_dir, paths)
+        return paths, sheet
+    
     def print_crash_summary(self):
         """Print a summary of detected crash events."""
         print("=== CAR CRASH EVENT DETECTION SUMMARY ===")
@@ -344,15 +714,54 @@ class CarVisualizer:
         
         for i, event in enumerate(self.crash_events, 1):
             print(f"Event {i}:")
-            print(f"  Time: {event['time']:.2f} seconds")
+            if 'end_time' in event:
+                print(f"  Time: {event['time']:.2f} - {event['end_time']:.2f} seconds "
+                      f"({event['end_time'] - event['time']:.2f} s)")
+            else:
+                print(f"  Time: {event['time']:.2f} seconds")
             print(f"  Type: {event['type']}")
             if 'magnitude' in event:
                 print(f"  Magnitude: {event['magnitude']:.3f}")
             if 'roll' in event:
-                print(f"  Roll: {event['roll']:.3f} rad ({np.degrees(event['roll']):.1f}°)")
-                print(f"  Pitch: {event['pitch']:.3f} rad ({np.degrees(event['pitch']):.1f}°)")
+                label = "Peak " if 'end_time' in event else ""
+                print(f"  {label}Roll: {event['roll']:.3f} rad ({np.degrees(event['roll']):.1f}°)")
+                print(f"  {label}Pitch: {event['pitch']:.3f} rad ({np.degrees(event['pitch']):.1f}°)")
             print()
 
+# Per-process state of export_animation workers (set once by the initializer)
+_export = {}
+
+def _init_export_worker(visualizer, frames, figsize, dpi):
+    """Build one headless Agg figure and scene per worker process."""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection='3d')
+    _export.update(visualizer=visualizer, frames=frames, fig=fig,
+                   scene=visualizer._init_scene(ax))
+
+def _render_frame_range(start, stop):
+    """Render frames [start, stop) to raw RGB bytes."""
+    fig = _export['fig']
+    buffers = []
+    for frame in range(start, stop):
+        _export['visualizer']._draw_frame(_export['scene'], _export['frames'], frame)
+        fig.canvas.draw()
+        rgb = np.asarray(fig.canvas.buffer_rgba())[..., :3]
+        buffers.append(rgb.tobytes())
+    return (rgb.shape[1], rgb.shape[0]), buffers
+
+def _render_thumbnails(body_faces, jobs, width, height):
+    """Draw (path, vertices, color, caption) jobs to PNG files with the raster renderer."""
+    renderer = RasterCarRenderer(width, height)
+    for path, vertices, color, caption in jobs:
+        image = Image.fromarray(renderer.render(vertices, body_faces, color=color, wheels=WHEEL_CENTERS,
+                                                wheel_radius=WHEEL_RADIUS))
+        ImageDraw.Draw(image).text((4, 4), caption, fill=(0, 0, 0))
+        # Write under a temporary name so a crashed worker never leaves a partial cache entry
+        tmp = f"{path}.{os.getpid()}.tmp"
+        image.save(tmp, format='png')
+        os.replace(tmp, path)
+
 def main():
     """Main function to run the car visualizer."""
     print("Loading car motion data...")
@@ -367,13 +776,11 @@ def main():
     plt.savefig('car_static_views.png', dpi=300, bbox_inches='tight')
     plt.show()
     
-    # Create animation of the most interesting period (around crash events)
-    print("\nCreating car animation around crash events...")
-    anim = visualizer.create_car_animation(start_time=84.0, end_time=85.0, interval=100)
-    
-    # Save animation
-    print("Saving animation...")
-    anim.save('car_animation.gif', writer='pillow', fps=10)
+    # Export animation of the most interesting period (around crash events),
+    # rendering frame ranges in parallel worker processes
+    print("\nExporting car animation around crash events...")
+    n_frames = visualizer.export_animation('car_animation.gif', start_time=84.0, end_time=85.0, fps=10)
+    print(f"Saved {n_frames} frames")
     
     print("\nVisualization complete!")
     print("Files created:")
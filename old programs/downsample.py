@@ -0,0 +1,80 @@
+import numpy as np
+
+def m4_decimate(x, y, n_bins):
+    """
+    Min/max (M4) decimation: keep the first, last, min and max sample of each bucket.
+    Buckets are equal runs of samples, which matches one pixel column for
+    evenly sampled sensor logs, so every spike survives at plot resolution.
+
+    Args:
+        x (array-like): Sample positions (monotonic)
+        y (array-like): Sample values
+        n_bins (int): Number of buckets, normally the plot width in pixels
+
+    Returns:
+        tuple: (x, y) numpy arrays with at most 4 * n_bins points
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n_bins <= 0 or n <= 4 * n_bins:
+        return x, y
+
+    # Pad to a whole number of buckets by repeating the last sample
+    size = -(-n // n_bins)
+    padded = np.pad(y.astype(float, copy=False), (0, size * n_bins - n), mode='edge')
+    buckets = padded.reshape(n_bins, size)
+
+    # NaNs must not win the min/max; an all-NaN bucket keeps its gap
+    offsets = np.arange(n_bins) * size
+    lo = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1) + offsets
+    hi = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1) + offsets
+
+    idx = np.concatenate([offsets, np.minimum(offsets + size - 1, n - 1), lo, hi])
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], y[idx]
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets decimation.
+    Picks the visually most significant sample per bucket; smoother than M4
+    but only keeps one point per bucket.
+
+    Args:
+        x (array-like): Sample positions (monotonic)
+        y (array-like): Sample values
+        n_out (int): Number of points to return (>= 3)
+
+    Returns:
+        tuple: (x, y) numpy arrays with n_out points
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+
+    xf = x.astype(float, copy=False)
+    yf = y.astype(float, copy=False)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        nxt = slice(edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else slice(n - 1, n)
+        cx, cy = xf[nxt].mean(), yf[nxt].mean()
+        area = np.abs((xf[a] - cx) * (yf[start:stop] - yf[a]) -
+                      (xf[a] - xf[start:stop]) * (cy - yf[a]))
+        a = start + int(np.nanargmax(area)) if np.any(~np.isnan(area)) else start
+        idx[i + 1] = a
+
+    return x[idx], y[idx]
+
+def decimate(x, y, n_px, method='m4'):
+    """Reduce a series to roughly n_px points using 'm4' or 'lttb'."""
+    if method == 'lttb':
+        return lttb(x, y, 2 * n_px)
+    return m4_decimate(x, y, n_px)
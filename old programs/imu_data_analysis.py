@@ -2,13 +2,58 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 from datetime import datetime
 import seaborn as sns
+from report import line_panel, hist_panel, render_report
+from ros_imu import ROS_IMU_COLUMNS, read_ros_imu_csv, iter_ros_imu_csv, NSEC_PER_SEC
+
+# Shared modules (timing analysis) live at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from imu_timing import TimingAnalyzer
 
 # Set style for better looking plots
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Output resolution and per-panel size of the 3x3 report grid
+SAVE_DPI = 300
+PANEL_SIZE = (20 / 3, 16 / 3)
+
+def analyze_timing(path, chunksize=1_000_000):
+    """Stream a ROS IMU export's timestamps through the timing analyzer and print the findings."""
+    analyzer = TimingAnalyzer()
+    for chunk in iter_ros_imu_csv(path, fields=[], chunksize=chunksize):
+        analyzer.update(chunk['timestamp_ns'].to_numpy())
+    r = analyzer.report()
+    
+    print(f"\n⏱️ {path}:")
+    print(f"   - Samples: {r['samples']} over {r['duration_s']:.2f} s")
+    print(f"   - Rate: mean {r['mean_rate_hz']:.1f} Hz, median {r['median_rate_hz']:.1f} Hz")
+    print(f"   - Interval (ms, ±{r['bin_resolution_pct']:.1f}% bins): " +
+          ", ".join(f"{k}={v:.3f}" for k, v in r['interval_ms'].items()))
+    print(f"   - Jitter (ms): p1-p99 {r['jitter_ms']['p1_to_p99']:.3f}, p0.1-p99.9 {r['jitter_ms']['p0.1_to_p99.9']:.3f}")
+    print(f"   - Gaps: {r['gaps']} ({r['gap_time_s']:.3f} s missing)")
+    for start, end in r['gap_intervals'][:5]:
+        print(f"     • {start:.3f} → {end:.3f} ({end - start:.3f} s)")
+    print(f"   - Duplicate stamps: {r['duplicates']}, out-of-order: {r['backwards']}")
+    
+    top = sorted(analyzer.rate_histogram(), key=lambda row: -row[2])[:3]
+    if top:
+        print("   - Most common rates: " + ", ".join(f"{lo:.1f}-{hi:.1f} Hz ({n})" for lo, hi, n in top))
+    return r
+
+def write_labeled_csv(path, output, magnitude, vector, chunksize=1_000_000):
+    """
+    Write a ROS IMU export with every column named (ROS_IMU_COLUMNS) plus
+    'datetime' and the magnitude of one vector field (e.g. 'linear_acceleration').
+    Read in chunks with all columns, apart from the slim frame the analysis uses.
+    """
+    for i, chunk in enumerate(pd.read_csv(path, header=None, names=ROS_IMU_COLUMNS, chunksize=chunksize)):
+        chunk['datetime'] = pd.to_datetime(chunk['timestamp_sec'] * NSEC_PER_SEC + chunk['timestamp_nsec'], unit='ns')
+        chunk[magnitude] = np.sqrt(chunk[f'{vector}_x']**2 + chunk[f'{vector}_y']**2 + chunk[f'{vector}_z']**2)
+        chunk.to_csv(output, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
 def analyze_imu_data():
     """
     Analyze and interpret IMU (Inertial Measurement Unit) data from camera sensors.
@@ -19,8 +64,8 @@ def analyze_imu_data():
     print("IMU DATA ANALYSIS & INTERPRETATION")
     print("="*80)
     
-    # Create a large figure for all plots
-    fig = plt.figure(figsize=(20, 16))
+    # Panels are rendered in parallel and cached by content at the end
+    panels = []
     
     # ===== ACCELEROMETER DATA ANALYSIS =====
     print("\n📊 ACCELEROMETER DATA ANALYSIS:")
@@ -28,63 +73,17 @@ def analyze_imu_data():
     
     try:
         # Read accelerometer data
-        accel_data = pd.read_csv('accel.csv', header=None)
-        
-        # Define column labels based on ROS IMU message structure
-        accel_columns = [
-            'timestamp_sec',           # Unix timestamp (seconds)
-            'timestamp_nsec',          # Unix timestamp (nanoseconds)
-            'frame_id',                # Reference frame (camera_accel_optical_frame)
-            'orientation_x',           # Quaternion orientation X
-            'orientation_y',           # Quaternion orientation Y
-            'orientation_z',           # Quaternion orientation Z
-            'orientation_w',           # Quaternion orientation W
-            'orientation_covariance_0', # Orientation covariance matrix (3x3)
-            'orientation_covariance_1',
-            'orientation_covariance_2',
-            'orientation_covariance_3',
-            'orientation_covariance_4',
-            'orientation_covariance_5',
-            'orientation_covariance_6',
-            'orientation_covariance_7',
-            'orientation_covariance_8',
-            'angular_velocity_x',      # Angular velocity X (rad/s)
-            'angular_velocity_y',      # Angular velocity Y (rad/s)
-            'angular_velocity_z',      # Angular velocity Z (rad/s)
-            'angular_velocity_covariance_0', # Angular velocity covariance
-            'angular_velocity_covariance_1',
-            'angular_velocity_covariance_2',
-            'angular_velocity_covariance_3',
-            'angular_velocity_covariance_4',
-            'angular_velocity_covariance_5',
-            'angular_velocity_covariance_6',
-            'angular_velocity_covariance_7',
-            'angular_velocity_covariance_8',
-            'linear_acceleration_x',   # Linear acceleration X (m/s²)
-            'linear_acceleration_y',   # Linear acceleration Y (m/s²)
-            'linear_acceleration_z',   # Linear acceleration Z (m/s²)
-            'linear_acceleration_covariance_0', # Linear acceleration covariance
-            'linear_acceleration_covariance_1',
-            'linear_acceleration_covariance_2',
-            'linear_acceleration_covariance_3',
-            'linear_acceleration_covariance_4',
-            'linear_acceleration_covariance_5',
-            'linear_acceleration_covariance_6',
-            'linear_acceleration_covariance_7',
-            'linear_acceleration_covariance_8'
-        ]
-        
-        # Assign column names
-        accel_data.columns = accel_columns
+        accel_data = read_ros_imu_csv('accel.csv')
         
         print(f"📈 Accelerometer Data Summary:")
         print(f"   - Total data points: {len(accel_data)}")
-        print(f"   - Time range: {accel_data['timestamp_sec'].min()} to {accel_data['timestamp_sec'].max()}")
-        print(f"   - Duration: {accel_data['timestamp_sec'].max() - accel_data['timestamp_sec'].min():.2f} seconds")
-        print(f"   - Sampling rate: ~{len(accel_data) / (accel_data['timestamp_sec'].max() - accel_data['timestamp_sec'].min()):.1f} Hz")
+        duration = (accel_data['timestamp_ns'].max() - accel_data['timestamp_ns'].min()) / NSEC_PER_SEC
+        print(f"   - Time range: {accel_data['timestamp_ns'].min() // NSEC_PER_SEC} to {accel_data['timestamp_ns'].max() // NSEC_PER_SEC}")
+        print(f"   - Duration: {duration:.2f} seconds")
+        print(f"   - Sampling rate: ~{len(accel_data) / duration:.1f} Hz")
         
         # Convert timestamp to datetime for better interpretation
-        accel_data['datetime'] = pd.to_datetime(accel_data['timestamp_sec'], unit='s')
+        accel_data['datetime'] = pd.to_datetime(accel_data['timestamp_ns'], unit='ns')
         
         print(f"\n📊 Linear Acceleration Analysis:")
         print(f"   - X-axis range: {accel_data['linear_acceleration_x'].min():.3f} to {accel_data['linear_acceleration_x'].max():.3f} m/s²")
@@ -98,25 +97,17 @@ def analyze_imu_data():
         print(f"   - Z-axis range: {accel_data['angular_velocity_z'].min():.3f} to {accel_data['angular_velocity_z'].max():.3f} rad/s")
         
         # Plot accelerometer data
-        plt.subplot(3, 3, 1)
-        plt.plot(accel_data.index, accel_data['linear_acceleration_x'], 'r-', label='X-axis', linewidth=1.5)
-        plt.plot(accel_data.index, accel_data['linear_acceleration_y'], 'g-', label='Y-axis', linewidth=1.5)
-        plt.plot(accel_data.index, accel_data['linear_acceleration_z'], 'b-', label='Z-axis', linewidth=1.5)
-        plt.title('Linear Acceleration (m/s²)')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Acceleration (m/s²)')
-        plt.legend()
-        plt.grid(True)
-        
-        plt.subplot(3, 3, 2)
-        plt.plot(accel_data.index, accel_data['angular_velocity_x'], 'r-', label='X-axis', linewidth=1.5)
-        plt.plot(accel_data.index, accel_data['angular_velocity_y'], 'g-', label='Y-axis', linewidth=1.5)
-        plt.plot(accel_data.index, accel_data['angular_velocity_z'], 'b-', label='Z-axis', linewidth=1.5)
-        plt.title('Angular Velocity (rad/s)')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Angular Velocity (rad/s)')
-        plt.legend()
-        plt.grid(True)
+        panels.append(line_panel('Linear Acceleration (m/s²)', 'Sample Index', 'Acceleration (m/s²)', [
+            (accel_data.index, accel_data['linear_acceleration_x'], 'r-', {'label': 'X-axis', 'linewidth': 1.5}),
+            (accel_data.index, accel_data['linear_acceleration_y'], 'g-', {'label': 'Y-axis', 'linewidth': 1.5}),
+            (accel_data.index, accel_data['linear_acceleration_z'], 'b-', {'label': 'Z-axis', 'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
+        
+        panels.append(line_panel('Angular Velocity (rad/s)', 'Sample Index', 'Angular Velocity (rad/s)', [
+            (accel_data.index, accel_data['angular_velocity_x'], 'r-', {'label': 'X-axis', 'linewidth': 1.5}),
+            (accel_data.index, accel_data['angular_velocity_y'], 'g-', {'label': 'Y-axis', 'linewidth': 1.5}),
+            (accel_data.index, accel_data['angular_velocity_z'], 'b-', {'label': 'Z-axis', 'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
         # Calculate magnitude of acceleration
         accel_data['acceleration_magnitude'] = np.sqrt(
@@ -125,23 +116,16 @@ def analyze_imu_data():
             accel_data['linear_acceleration_z']**2
         )
         
-        plt.subplot(3, 3, 3)
-        plt.plot(accel_data.index, accel_data['acceleration_magnitude'], 'purple', linewidth=1.5)
-        plt.title('Acceleration Magnitude')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Magnitude (m/s²)')
-        plt.grid(True)
+        panels.append(line_panel('Acceleration Magnitude', 'Sample Index', 'Magnitude (m/s²)', [
+            (accel_data.index, accel_data['acceleration_magnitude'], 'purple', {'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
         # Histogram of acceleration values
-        plt.subplot(3, 3, 4)
-        plt.hist(accel_data['linear_acceleration_x'], bins=50, alpha=0.7, label='X-axis', color='red')
-        plt.hist(accel_data['linear_acceleration_y'], bins=50, alpha=0.7, label='Y-axis', color='green')
-        plt.hist(accel_data['linear_acceleration_z'], bins=50, alpha=0.7, label='Z-axis', color='blue')
-        plt.title('Acceleration Distribution')
-        plt.xlabel('Acceleration (m/s²)')
-        plt.ylabel('Frequency')
-        plt.legend()
-        plt.grid(True)
+        panels.append(hist_panel('Acceleration Distribution', 'Acceleration (m/s²)', 'Frequency', [
+            (accel_data['linear_acceleration_x'], {'alpha': 0.7, 'label': 'X-axis', 'color': 'red'}),
+            (accel_data['linear_acceleration_y'], {'alpha': 0.7, 'label': 'Y-axis', 'color': 'green'}),
+            (accel_data['linear_acceleration_z'], {'alpha': 0.7, 'label': 'Z-axis', 'color': 'blue'}),
+        ], bins=50))
         
     except Exception as e:
         print(f"   ❌ Error reading accelerometer data: {e}")
@@ -152,60 +136,15 @@ def analyze_imu_data():
     
     try:
         # Read gyroscope data
-        gyro_data = pd.read_csv('camera_camera_gyro_sample.csv', header=None)
-        
-        # Define column labels for gyroscope data (40 columns)
-        gyro_columns = [
-            'timestamp_sec',           # Unix timestamp (seconds)
-            'timestamp_nsec',          # Unix timestamp (nanoseconds)
-            'frame_id',                # Reference frame (camera_gyro_optical_frame)
-            'orientation_x',           # Quaternion orientation X
-            'orientation_y',           # Quaternion orientation Y
-            'orientation_z',           # Quaternion orientation Z
-            'orientation_w',           # Quaternion orientation W
-            'orientation_covariance_0', # Orientation covariance matrix (3x3)
-            'orientation_covariance_1',
-            'orientation_covariance_2',
-            'orientation_covariance_3',
-            'orientation_covariance_4',
-            'orientation_covariance_5',
-            'orientation_covariance_6',
-            'orientation_covariance_7',
-            'orientation_covariance_8',
-            'angular_velocity_x',      # Angular velocity X (rad/s)
-            'angular_velocity_y',      # Angular velocity Y (rad/s)
-            'angular_velocity_z',      # Angular velocity Z (rad/s)
-            'angular_velocity_covariance_0', # Angular velocity covariance
-            'angular_velocity_covariance_1',
-            'angular_velocity_covariance_2',
-            'angular_velocity_covariance_3',
-            'angular_velocity_covariance_4',
-            'angular_velocity_covariance_5',
-            'angular_velocity_covariance_6',
-            'angular_velocity_covariance_7',
-            'angular_velocity_covariance_8',
-            'linear_acceleration_x',   # Linear acceleration X (m/s²)
-            'linear_acceleration_y',   # Linear acceleration Y (m/s²)
-            'linear_acceleration_z',   # Linear acceleration Z (m/s²)
-            'linear_acceleration_covariance_0', # Linear acceleration covariance
-            'linear_acceleration_covariance_1',
-            'linear_acceleration_covariance_2',
-            'linear_acceleration_covariance_3',
-            'linear_acceleration_covariance_4',
-            'linear_acceleration_covariance_5',
-            'linear_acceleration_covariance_6',
-            'linear_acceleration_covariance_7',
-            'linear_acceleration_covariance_8'
-        ]
+        gyro_data = read_ros_imu_csv('camera_camera_gyro_sample.csv')
         
-        # Assign column names
-        gyro_data.columns = gyro_columns
         
         print(f"📈 Gyroscope Data Summary:")
         print(f"   - Total data points: {len(gyro_data)}")
-        print(f"   - Time range: {gyro_data['timestamp_sec'].min()} to {gyro_data['timestamp_sec'].max()}")
-        print(f"   - Duration: {gyro_data['timestamp_sec'].max() - gyro_data['timestamp_sec'].min():.2f} seconds")
-        print(f"   - Sampling rate: ~{len(gyro_data) / (gyro_data['timestamp_sec'].max() - gyro_data['timestamp_sec'].min()):.1f} Hz")
+        duration = (gyro_data['timestamp_ns'].max() - gyro_data['timestamp_ns'].min()) / NSEC_PER_SEC
+        print(f"   - Time range: {gyro_data['timestamp_ns'].min() // NSEC_PER_SEC} to {gyro_data['timestamp_ns'].max() // NSEC_PER_SEC}")
+        print(f"   - Duration: {duration:.2f} seconds")
+        print(f"   - Sampling rate: ~{len(gyro_data) / duration:.1f} Hz")
         
         print(f"\n🔄 Angular Velocity Analysis:")
         print(f"   - X-axis range: {gyro_data['angular_velocity_x'].min():.3f} to {gyro_data['angular_velocity_x'].max():.3f} rad/s")
@@ -221,15 +160,11 @@ def analyze_imu_data():
         print(f"   - Z-axis range: {gyro_data['linear_acceleration_z'].min():.3f} to {gyro_data['linear_acceleration_z'].max():.3f} m/s²")
         
         # Plot gyroscope data
-        plt.subplot(3, 3, 5)
-        plt.plot(gyro_data.index, gyro_data['angular_velocity_x'], 'r-', label='X-axis', linewidth=1.5)
-        plt.plot(gyro_data.index, gyro_data['angular_velocity_y'], 'g-', label='Y-axis', linewidth=1.5)
-        plt.plot(gyro_data.index, gyro_data['angular_velocity_z'], 'b-', label='Z-axis', linewidth=1.5)
-        plt.title('Gyroscope Angular Velocity (rad/s)')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Angular Velocity (rad/s)')
-        plt.legend()
-        plt.grid(True)
+        panels.append(line_panel('Gyroscope Angular Velocity (rad/s)', 'Sample Index', 'Angular Velocity (rad/s)', [
+            (gyro_data.index, gyro_data['angular_velocity_x'], 'r-', {'label': 'X-axis', 'linewidth': 1.5}),
+            (gyro_data.index, gyro_data['angular_velocity_y'], 'g-', {'label': 'Y-axis', 'linewidth': 1.5}),
+            (gyro_data.index, gyro_data['angular_velocity_z'], 'b-', {'label': 'Z-axis', 'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
         # Calculate magnitude of angular velocity
         gyro_data['angular_velocity_magnitude'] = np.sqrt(
@@ -238,23 +173,16 @@ def analyze_imu_data():
             gyro_data['angular_velocity_z']**2
         )
         
-        plt.subplot(3, 3, 6)
-        plt.plot(gyro_data.index, gyro_data['angular_velocity_magnitude'], 'orange', linewidth=1.5)
-        plt.title('Angular Velocity Magnitude')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Magnitude (rad/s)')
-        plt.grid(True)
+        panels.append(line_panel('Angular Velocity Magnitude', 'Sample Index', 'Magnitude (rad/s)', [
+            (gyro_data.index, gyro_data['angular_velocity_magnitude'], 'orange', {'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
         # Histogram of angular velocity values
-        plt.subplot(3, 3, 7)
-        plt.hist(gyro_data['angular_velocity_x'], bins=50, alpha=0.7, label='X-axis', color='red')
-        plt.hist(gyro_data['angular_velocity_y'], bins=50, alpha=0.7, label='Y-axis', color='green')
-        plt.hist(gyro_data['angular_velocity_z'], bins=50, alpha=0.7, label='Z-axis', color='blue')
-        plt.title('Angular Velocity Distribution')
-        plt.xlabel('Angular Velocity (rad/s)')
-        plt.ylabel('Frequency')
-        plt.legend()
-        plt.grid(True)
+        panels.append(hist_panel('Angular Velocity Distribution', 'Angular Velocity (rad/s)', 'Frequency', [
+            (gyro_data['angular_velocity_x'], {'alpha': 0.7, 'label': 'X-axis', 'color': 'red'}),
+            (gyro_data['angular_velocity_y'], {'alpha': 0.7, 'label': 'Y-axis', 'color': 'green'}),
+            (gyro_data['angular_velocity_z'], {'alpha': 0.7, 'label': 'Z-axis', 'color': 'blue'}),
+        ], bins=50))
         
     except Exception as e:
         print(f"   ❌ Error reading gyroscope data: {e}")
@@ -265,15 +193,13 @@ def analyze_imu_data():
     
     try:
         # Read sample accelerometer data
-        sample_accel_data = pd.read_csv('camera_camera_accel_sample.csv', header=None)
-        
-        # Use same column structure as main accelerometer data
-        sample_accel_data.columns = accel_columns
+        sample_accel_data = read_ros_imu_csv('camera_camera_accel_sample.csv')
         
         print(f"📈 Sample Accelerometer Data Summary:")
         print(f"   - Total data points: {len(sample_accel_data)}")
-        print(f"   - Time range: {sample_accel_data['timestamp_sec'].min()} to {sample_accel_data['timestamp_sec'].max()}")
-        print(f"   - Duration: {sample_accel_data['timestamp_sec'].max() - sample_accel_data['timestamp_sec'].min():.2f} seconds")
+        duration = (sample_accel_data['timestamp_ns'].max() - sample_accel_data['timestamp_ns'].min()) / NSEC_PER_SEC
+        print(f"   - Time range: {sample_accel_data['timestamp_ns'].min() // NSEC_PER_SEC} to {sample_accel_data['timestamp_ns'].max() // NSEC_PER_SEC}")
+        print(f"   - Duration: {duration:.2f} seconds")
         
         print(f"\n📊 Sample Linear Acceleration Analysis:")
         print(f"   - X-axis range: {sample_accel_data['linear_acceleration_x'].min():.3f} to {sample_accel_data['linear_acceleration_x'].max():.3f} m/s²")
@@ -281,15 +207,11 @@ def analyze_imu_data():
         print(f"   - Z-axis range: {sample_accel_data['linear_acceleration_z'].min():.3f} to {sample_accel_data['linear_acceleration_z'].max():.3f} m/s²")
         
         # Plot sample accelerometer data
-        plt.subplot(3, 3, 8)
-        plt.plot(sample_accel_data.index, sample_accel_data['linear_acceleration_x'], 'r-', label='X-axis', linewidth=1.5)
-        plt.plot(sample_accel_data.index, sample_accel_data['linear_acceleration_y'], 'g-', label='Y-axis', linewidth=1.5)
-        plt.plot(sample_accel_data.index, sample_accel_data['linear_acceleration_z'], 'b-', label='Z-axis', linewidth=1.5)
-        plt.title('Sample: Linear Acceleration (m/s²)')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Acceleration (m/s²)')
-        plt.legend()
-        plt.grid(True)
+        panels.append(line_panel('Sample: Linear Acceleration (m/s²)', 'Sample Index', 'Acceleration (m/s²)', [
+            (sample_accel_data.index, sample_accel_data['linear_acceleration_x'], 'r-', {'label': 'X-axis', 'linewidth': 1.5}),
+            (sample_accel_data.index, sample_accel_data['linear_acceleration_y'], 'g-', {'label': 'Y-axis', 'linewidth': 1.5}),
+            (sample_accel_data.index, sample_accel_data['linear_acceleration_z'], 'b-', {'label': 'Z-axis', 'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
         # Calculate and plot acceleration magnitude for sample
         sample_accel_data['acceleration_magnitude'] = np.sqrt(
@@ -298,20 +220,17 @@ def analyze_imu_data():
             sample_accel_data['linear_acceleration_z']**2
         )
         
-        plt.subplot(3, 3, 9)
-        plt.plot(sample_accel_data.index, sample_accel_data['acceleration_magnitude'], 'purple', linewidth=1.5)
-        plt.title('Sample: Acceleration Magnitude')
-        plt.xlabel('Sample Index')
-        plt.ylabel('Magnitude (m/s²)')
-        plt.grid(True)
+        panels.append(line_panel('Sample: Acceleration Magnitude', 'Sample Index', 'Magnitude (m/s²)', [
+            (sample_accel_data.index, sample_accel_data['acceleration_magnitude'], 'purple', {'linewidth': 1.5}),
+        ], size=PANEL_SIZE, dpi=SAVE_DPI))
         
     except Exception as e:
         print(f"   ❌ Error reading sample accelerometer data: {e}")
     
     # Save the plot
-    plt.tight_layout()
-    plt.savefig('imu_data_analysis.png', dpi=300, bbox_inches='tight')
-    print(f"\n📊 Plots saved as 'imu_data_analysis.png'")
+    _, rendered, cached = render_report(panels, 'imu_data_analysis.png', ncols=3,
+                                        size=PANEL_SIZE, dpi=SAVE_DPI)
+    print(f"\n📊 Plots saved as 'imu_data_analysis.png' ({rendered} panels rendered, {cached} reused from cache)")
     
     # ===== DATA INTERPRETATION GUIDE =====
     print("\n\n📖 DATA INTERPRETATION GUIDE:")
@@ -321,6 +240,7 @@ def analyze_imu_data():
     print("-" * 30)
     print("• timestamp_sec: Unix timestamp in seconds (when measurement was taken)")
     print("• timestamp_nsec: Nanosecond precision for timestamp")
+    print("  (combined into timestamp_ns for the analysis; the labeled CSVs keep every column)")
     print("• frame_id: Reference coordinate frame (camera_accel_optical_frame)")
     print("• orientation_x/y/z/w: Quaternion representing sensor orientation")
     print("• orientation_covariance_0-8: 3x3 covariance matrix for orientation uncertainty")
@@ -359,20 +279,30 @@ def analyze_imu_data():
     print("• Covariance values: Lower = more reliable measurement")
     print("• Sudden spikes: May indicate sensor noise or actual events")
     print("• Consistent bias: May indicate sensor calibration needed")
-    print("• Missing data: Check for gaps in timestamps")
+    print("• Missing data: Gaps in timestamps (measured below)")
+    
+    print("\n⏱️ TIMESTAMP QUALITY:")
+    print("-" * 20)
+    for path in ('accel.csv', 'camera_camera_gyro_sample.csv', 'camera_camera_accel_sample.csv'):
+        try:
+            analyze_timing(path)
+        except Exception as e:
+            print(f"   ❌ Error analyzing timestamps in {path}: {e}")
     
     # Create labeled CSV files
     try:
         # Save labeled accelerometer data
-        accel_data.to_csv('accel_labeled.csv', index=False)
+        write_labeled_csv('accel.csv', 'accel_labeled.csv', 'acceleration_magnitude', 'linear_acceleration')
         print(f"\n💾 Labeled accelerometer data saved as 'accel_labeled.csv'")
         
         # Save labeled gyroscope data
-        gyro_data.to_csv('gyro_labeled.csv', index=False)
+        write_labeled_csv('camera_camera_gyro_sample.csv', 'gyro_labeled.csv',
+                          'angular_velocity_magnitude', 'angular_velocity')
         print(f"💾 Labeled gyroscope data saved as 'gyro_labeled.csv'")
         
         # Save labeled sample accelerometer data
-        sample_accel_data.to_csv('sample_accel_labeled.csv', index=False)
+        write_labeled_csv('camera_camera_accel_sample.csv', 'sample_accel_labeled.csv',
+                          'acceleration_magnitude', 'linear_acceleration')
         print(f"💾 Labeled sample accelerometer data saved as 'sample_accel_labeled.csv'")
         
     except Exception as e:
@@ -0,0 +1,212 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib.style
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from downsample import decimate
+
+# Bump when render_panel changes so stale cached panels are not reused
+RENDER_VERSION = 1
+
+PANEL_SIZE = (5, 4)   # inches
+DPI = 300
+STYLE = 'seaborn-v0_8-darkgrid'
+CACHE_DIR = '.report_cache'
+# Least recently used cache entries beyond this many are deleted
+CACHE_MAX_FILES = 2000
+
+def line_panel(title, xlabel, ylabel, lines, size=PANEL_SIZE, dpi=DPI, method='m4'):
+    """
+    Build a line-plot panel spec.
+    Each line is (x, y, fmt, kwargs); series are decimated to the panel's
+    pixel width here, so workers receive and hash only what gets drawn.
+    """
+    n_px = int(size[0] * dpi)
+    series = []
+    for x, y, fmt, kwargs in lines:
+        xd, yd = decimate(np.asarray(x), np.asarray(y), n_px, method=method)
+        series.append({'x': xd, 'y': yd, 'fmt': fmt, 'kwargs': dict(kwargs)})
+    return {'kind': 'line', 'title': title, 'xlabel': xlabel, 'ylabel': ylabel, 'series': series}
+
+def hist_panel(title, xlabel, ylabel, hists, bins=50):
+    """
+    Build a histogram panel spec from (data, kwargs) pairs.
+    Counts are computed here; workers only draw the binned result.
+    """
+    series = []
+    for data, kwargs in hists:
+        data = np.asarray(data)
+        counts, edges = np.histogram(data[np.isfinite(data)], bins=bins)
+        series.append({'counts': counts, 'edges': edges, 'kwargs': dict(kwargs)})
+    return {'kind': 'hist', 'title': title, 'xlabel': xlabel, 'ylabel': ylabel, 'series': series}
+
+def bar_panel(title, xlabel, ylabel, categories, bars):
+    """Build a grouped bar panel spec from (values, label) pairs per group."""
+    series = [{'values': np.asarray(values, dtype=float), 'label': label} for values, label in bars]
+    return {'kind': 'bar', 'title': title, 'xlabel': xlabel, 'ylabel': ylabel,
+            'categories': list(categories), 'series': series}
+
+def _feed(h, value):
+    """Feed a panel spec into a hash in a stable, type-aware way."""
+    if isinstance(value, np.ndarray):
+        h.update(f"nd{value.dtype.str}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for key in sorted(value):
+            h.update(repr(key).encode())
+            _feed(h, value[key])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for item in value:
+            _feed(h, item)
+        h.update(b"]")
+    else:
+        h.update(repr(value).encode())
+
+def panel_key(panel, size=PANEL_SIZE, dpi=DPI, style=STYLE):
+    """Content hash of a panel and everything that affects its pixels."""
+    h = hashlib.sha256()
+    _feed(h, (RENDER_VERSION, tuple(size), dpi, style, panel))
+    return h.hexdigest()
+
+def render_panel(panel, path, size=PANEL_SIZE, dpi=DPI, style=STYLE):
+    """
+    Render one panel spec to a PNG with the Agg canvas.
+    Uses Figure directly (no pyplot), so it is safe in worker processes
+    regardless of the interactive backend of the parent.
+    """
+    with matplotlib.style.context(style):
+        fig = Figure(figsize=size, dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        if panel.get('palette'):
+            ax.set_prop_cycle(color=panel['palette'])
+
+        if panel['kind'] == 'line':
+            for s in panel['series']:
+                ax.plot(s['x'], s['y'], s['fmt'], **s['kwargs'])
+        elif panel['kind'] == 'hist':
+            for s in panel['series']:
+                ax.stairs(s['counts'], s['edges'], fill=True, **s['kwargs'])
+        elif panel['kind'] == 'bar':
+            x = np.arange(len(panel['categories']))
+            width = 0.8 / max(len(panel['series']), 1)
+            for i, s in enumerate(panel['series']):
+                offset = (i - (len(panel['series']) - 1) / 2) * width
+                ax.bar(x + offset, s['values'], width, label=s['label'], alpha=0.8)
+            ax.set_xticks(x)
+            ax.set_xticklabels(panel['categories'])
+
+        ax.set_title(panel['title'])
+        ax.set_xlabel(panel['xlabel'])
+        ax.set_ylabel(panel['ylabel'])
+        if ax.get_legend_handles_labels()[1]:
+            ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+
+        # Write under a temporary name so a crashed worker never leaves a partial cache entry
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fig.savefig(tmp, format='png', dpi=dpi)
+        os.replace(tmp, path)
+    return path
+
+def tile_images(paths, output, ncols, background=(255, 255, 255)):
+    """Composite equally sized panel images into one grid image."""
+    if not paths:
+        return None
+    # Only read headers for the layout; open one image at a time while pasting
+    # so thousands of thumbnails never hold thousands of file handles
+    sizes = []
+    for p in paths:
+        with Image.open(p) as im:
+            sizes.append(im.size)
+    w = max(size[0] for size in sizes)
+    h = max(size[1] for size in sizes)
+    ncols = min(ncols, len(paths))
+    nrows = -(-len(paths) // ncols)
+
+    sheet = Image.new('RGB', (w * ncols, h * nrows), background)
+    for i, p in enumerate(paths):
+        with Image.open(p) as im:
+            sheet.paste(im.convert('RGB'), ((i % ncols) * w, (i // ncols) * h))
+    sheet.save(output)
+    return output
+
+def cached_paths(cache_dir, keys):
+    """
+    Cache paths for keys, plus {path: index of its first key} of those not
+    cached yet. Entries that are reused are touched, so prune_cache() sees
+    when they were last used.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, f"{key}.png") for key in keys]
+    todo = {}
+    for i, path in enumerate(paths):
+        if path in todo:
+            continue
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            todo[path] = i
+    return paths, todo
+
+def prune_cache(cache_dir, keep=(), max_files=CACHE_MAX_FILES):
+    """Delete the least recently used PNGs of cache_dir beyond max_files, never those in keep."""
+    keep = set(keep)
+    entries = [(e.stat().st_mtime, e.path) for e in os.scandir(cache_dir)
+               if e.name.endswith('.png') and e.is_file() and e.path not in keep]
+    excess = len(entries) + len(keep) - max_files
+    if excess <= 0:
+        return 0
+    entries.sort()
+    for _, path in entries[:excess]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return min(excess, len(entries))
+
+def render_report(panels, output, ncols=4, size=PANEL_SIZE, dpi=DPI, style=STYLE,
+                  palette=None, cache_dir=CACHE_DIR, max_workers=None):
+    """
+    Render panels in parallel (one process task per uncached panel) and tile them.
+
+    Args:
+        panels (list): Panel specs from line_panel / hist_panel / bar_panel
+        output (str): Path of the composited report image
+        ncols (int): Panels per row
+        size (tuple): Panel size in inches
+        dpi (int): Output resolution
+        style (str): Matplotlib style the panels are drawn in
+        palette (list): Colour cycle for every panel, e.g. sns.color_palette();
+            workers start from the style's defaults, not the caller's settings
+        cache_dir (str): Directory of rendered panels keyed by content hash,
+            pruned to CACHE_MAX_FILES
+        max_workers (int): Process pool size (defaults to CPU count)
+
+    Returns:
+        tuple: (output path, number of panels rendered, number reused from cache)
+    """
+    if palette is not None:
+        palette = [to_hex(color) for color in palette]
+        panels = [dict(panel, palette=palette) for panel in panels]
+    paths, todo = cached_paths(cache_dir, [panel_key(p, size, dpi, style) for p in panels])
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(render_panel, panels[i], path, size, dpi, style)
+                       for path, i in todo.items()]
+            for future in futures:
+                future.result()
+
+    tile_images(paths, output, ncols)
+    prune_cache(cache_dir, paths)
+    return output, len(todo), len(panels) - len(todo)
@@ -0,0 +1,91 @@
+import pandas as pd
+
+# Column layout of the header-less sensor_msgs/Imu CSV exports (40 columns)
+ROS_IMU_COLUMNS = [
+    'timestamp_sec',           # Unix timestamp (seconds)
+    'timestamp_nsec',          # Unix timestamp (nanoseconds)
+    'frame_id',                # Reference frame (camera_accel_optical_frame)
+    'orientation_x',           # Quaternion orientation X
+    'orientation_y',           # Quaternion orientation Y
+    'orientation_z',           # Quaternion orientation Z
+    'orientation_w',           # Quaternion orientation W
+    'orientation_covariance_0', # Orientation covariance matrix (3x3)
+    'orientation_covariance_1',
+    'orientation_covariance_2',
+    'orientation_covariance_3',
+    'orientation_covariance_4',
+    'orientation_covariance_5',
+    'orientation_covariance_6',
+    'orientation_covariance_7',
+    'orientation_covariance_8',
+    'angular_velocity_x',      # Angular velocity X (rad/s)
+    'angular_velocity_y',      # Angular velocity Y (rad/s)
+    'angular_velocity_z',      # Angular velocity Z (rad/s)
+    'angular_velocity_covariance_0', # Angular velocity covariance
+    'angular_velocity_covariance_1',
+    'angular_velocity_covariance_2',
+    'angular_velocity_covariance_3',
+    'angular_velocity_covariance_4',
+    'angular_velocity_covariance_5',
+    'angular_velocity_covariance_6',
+    'angular_velocity_covariance_7',
+    'angular_velocity_covariance_8',
+    'linear_acceleration_x',   # Linear acceleration X (m/s²)
+    'linear_acceleration_y',   # Linear acceleration Y (m/s²)
+    'linear_acceleration_z',   # Linear acceleration Z (m/s²)
+    'linear_acceleration_covariance_0', # Linear acceleration covariance
+    'linear_acceleration_covariance_1',
+    'linear_acceleration_covariance_2',
+    'linear_acceleration_covariance_3',
+    'linear_acceleration_covariance_4',
+    'linear_acceleration_covariance_5',
+    'linear_acceleration_covariance_6',
+    'linear_acceleration_covariance_7',
+    'linear_acceleration_covariance_8',
+]
+
+# Numeric fields the analysis scripts actually use
+IMU_FIELDS = [
+    'angular_velocity_x',
+    'angular_velocity_y',
+    'angular_velocity_z',
+    'linear_acceleration_x',
+    'linear_acceleration_y',
+    'linear_acceleration_z',
+]
+
+NSEC_PER_SEC = 1_000_000_000
+
+def _read_kwargs(fields):
+    """pd.read_csv arguments that load only the timestamp and the requested fields."""
+    positions = [0, 1] + [ROS_IMU_COLUMNS.index(f) for f in fields]
+    dtype = {i: 'float32' for i in positions[2:]}
+    dtype.update({0: 'int64', 1: 'int64'})
+    return {'header': None, 'usecols': positions, 'dtype': dtype, 'engine': 'c'}
+
+def _finish(df):
+    """Name the columns and fold sec/nsec into one int64 nanosecond timestamp."""
+    df.columns = [ROS_IMU_COLUMNS[i] for i in df.columns]
+    stamp = df.pop('timestamp_sec') * NSEC_PER_SEC + df.pop('timestamp_nsec')
+    df.insert(0, 'timestamp_ns', stamp)
+    return df
+
+def read_ros_imu_csv(path, fields=IMU_FIELDS):
+    """
+    Read a header-less ROS IMU CSV export.
+    Skips the frame_id string and unused orientation/covariance columns and
+    stores values as float32, which cuts memory per row by roughly 5-10x.
+
+    Args:
+        path (str): Path to the CSV export
+        fields (list): Names from ROS_IMU_COLUMNS to load besides the timestamp
+
+    Returns:
+        DataFrame: 'timestamp_ns' (int64) followed by the requested float32 fields
+    """
+    return _finish(pd.read_csv(path, **_read_kwargs(fields)))
+
+def iter_ros_imu_csv(path, fields=IMU_FIELDS, chunksize=1_000_000):
+    """Same as read_ros_imu_csv, but yields chunks for logs larger than memory."""
+    for chunk in pd.read_csv(path, chunksize=chunksize, **_read_kwargs(fields)):
+        yield _finish(chunk)
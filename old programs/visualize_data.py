@@ -2,383 +2,263 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
-from datetime import datetime
+import sys
+import glob
+from concurrent.futures import ProcessPoolExecutor
 import seaborn as sns
+from report import line_panel, bar_panel, render_report
 
 # Set style for better looking plots
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
-def analyze_data_files():
-    """Analyze and visualize all vehicle data files"""
-    
-    # Define paths
-    hardbrake_path = "raw data/hardbrake"
-    suddenturn_path = "raw data/suddenTurn"
-    
-    print("="*80)
-    print("VEHICLE DATA ANALYSIS REPORT")
-    print("="*80)
-    
-    # Create a large figure with multiple subplots
-    fig = plt.figure(figsize=(20, 24))
-    
-    # Define subplot positions
-    plot_num = 1
-    
-    # ===== HARD BRAKE DATA ANALYSIS =====
-    print("\n🚗 HARD BRAKE SCENARIO DATA:")
-    print("-" * 50)
-    
-    # 1. GPS Velocity Data
-    try:
-        gps_file = os.path.join(hardbrake_path, "2025-06-02-16-45-55-vehicle-gps-vel.csv")
-        gps_data = pd.read_csv(gps_file)
-        
-        print(f"📍 GPS Velocity Data:")
-        print(f"   - Time range: {len(gps_data)} data points")
-        print(f"   - Linear velocity components (x, y, z) in m/s")
-        print(f"   - Angular velocity components (x, y, z) in rad/s")
-        print(f"   - Max linear velocity: X={gps_data['.twist.linear.x'].max():.2f}, Y={gps_data['.twist.linear.y'].max():.2f}, Z={gps_data['.twist.linear.z'].max():.2f}")
-        
-        # Plot GPS velocity
-        plt.subplot(6, 4, plot_num)
-        plt.plot(gps_data.index, gps_data['.twist.linear.x'], 'r-', label='Linear X', linewidth=2)
-        plt.plot(gps_data.index, gps_data['.twist.linear.y'], 'g-', label='Linear Y', linewidth=2)
-        plt.plot(gps_data.index, gps_data['.twist.linear.z'], 'b-', label='Linear Z', linewidth=2)
-        plt.title('Hard Brake: GPS Linear Velocity')
-        plt.xlabel('Time Index')
-        plt.ylabel('Velocity (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading GPS data: {e}")
-    
-    # 2. Brake Report Data
-    try:
-        brake_file = os.path.join(hardbrake_path, "2025-06-02-16-45-55-vehicle-brake_report.csv")
-        brake_data = pd.read_csv(brake_file)
-        
-        print(f"\n🛑 Brake Report Data:")
-        print(f"   - Time range: {len(brake_data)} data points")
-        print(f"   - Brake pedal input/output (0-1 range)")
-        print(f"   - Brake torque input/output")
-        print(f"   - Max pedal input: {brake_data['.pedal_input'].max():.3f}")
-        print(f"   - Max torque input: {brake_data['.torque_input'].max():.3f}")
-        
-        # Plot brake data
-        plt.subplot(6, 4, plot_num)
-        plt.plot(brake_data.index, brake_data['.pedal_input'], 'r-', label='Pedal Input', linewidth=2)
-        plt.plot(brake_data.index, brake_data['.pedal_output'], 'b-', label='Pedal Output', linewidth=2)
-        plt.title('Hard Brake: Brake Pedal')
-        plt.xlabel('Time Index')
-        plt.ylabel('Pedal Position (0-1)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-        plt.subplot(6, 4, plot_num)
-        plt.plot(brake_data.index, brake_data['.torque_input'], 'r-', label='Torque Input', linewidth=2)
-        plt.plot(brake_data.index, brake_data['.torque_output'], 'b-', label='Torque Output', linewidth=2)
-        plt.title('Hard Brake: Brake Torque')
-        plt.xlabel('Time Index')
-        plt.ylabel('Torque (Nm)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading brake data: {e}")
-    
-    # 3. Throttle Report Data
-    try:
-        throttle_file = os.path.join(hardbrake_path, "2025-06-02-16-45-55-vehicle-throttle_report.csv")
-        throttle_data = pd.read_csv(throttle_file)
-        
-        print(f"\n⚡ Throttle Report Data:")
-        print(f"   - Time range: {len(throttle_data)} data points")
-        print(f"   - Throttle pedal input/output (0-1 range)")
-        print(f"   - Max pedal input: {throttle_data['.pedal_input'].max():.3f}")
-        print(f"   - Min pedal input: {throttle_data['.pedal_input'].min():.3f}")
-        
-        # Plot throttle data
-        plt.subplot(6, 4, plot_num)
-        plt.plot(throttle_data.index, throttle_data['.pedal_input'], 'g-', label='Throttle Input', linewidth=2)
-        plt.plot(throttle_data.index, throttle_data['.pedal_output'], 'orange', label='Throttle Output', linewidth=2)
-        plt.title('Hard Brake: Throttle Pedal')
-        plt.xlabel('Time Index')
-        plt.ylabel('Pedal Position (0-1)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading throttle data: {e}")
+# Output resolution; plotted series are decimated to the panel pixel width at this dpi
+SAVE_DPI = 300
+
+# Default scenarios: display name -> directory of recorded topic CSVs
+SCENARIOS = {
+    'Hard Brake': "raw data/hardbrake",
+    'Sudden Turn': "raw data/suddenTurn",
+}
+
+# Every recorded vehicle topic, keyed by the file suffix
+# (e.g. "2025-06-02-16-45-55-vehicle-gps-vel.csv" -> 'gps-vel').
+# 'lines' entries are (column, style, label); 'metrics' maps a column to the
+# aggregations reported for it; 'derived' columns are computed in the worker.
+TOPICS = {
+    'gps-vel': {
+        'label': '📍 GPS Velocity Data',
+        'name': 'GPS',
+        'columns': ['.twist.linear.x', '.twist.linear.y', '.twist.linear.z'],
+        'description': [
+            "Linear velocity components (x, y, z) in m/s",
+        ],
+        'metrics': {
+            '.twist.linear.x': ['max'],
+            '.twist.linear.y': ['max'],
+            '.twist.linear.z': ['max'],
+        },
+        'panels': [
+            {'title': 'GPS Linear Velocity', 'ylabel': 'Velocity (m/s)',
+             'lines': [('.twist.linear.x', 'r-', 'Linear X'),
+                       ('.twist.linear.y', 'g-', 'Linear Y'),
+                       ('.twist.linear.z', 'b-', 'Linear Z')]},
+        ],
+    },
+    'brake_report': {
+        'label': '🛑 Brake Report Data',
+        'name': 'brake',
+        'columns': ['.pedal_input', '.pedal_output', '.torque_input', '.torque_output'],
+        'description': [
+            "Brake pedal input/output (0-1 range)",
+            "Brake torque input/output",
+        ],
+        'metrics': {
+            '.pedal_input': ['max'],
+            '.torque_input': ['max'],
+        },
+        'panels': [
+            {'title': 'Brake Pedal', 'ylabel': 'Pedal Position (0-1)',
+             'lines': [('.pedal_input', 'r-', 'Pedal Input'),
+                       ('.pedal_output', 'b-', 'Pedal Output')]},
+            {'title': 'Brake Torque', 'ylabel': 'Torque (Nm)',
+             'lines': [('.torque_input', 'r-', 'Torque Input'),
+                       ('.torque_output', 'b-', 'Torque Output')]},
+        ],
+    },
+    'throttle_report': {
+        'label': '⚡ Throttle Report Data',
+        'name': 'throttle',
+        'columns': ['.pedal_input', '.pedal_output'],
+        'description': [
+            "Throttle pedal input/output (0-1 range)",
+        ],
+        'metrics': {
+            '.pedal_input': ['max', 'min'],
+        },
+        'panels': [
+            {'title': 'Throttle Pedal', 'ylabel': 'Pedal Position (0-1)',
+             'lines': [('.pedal_input', 'g-', 'Throttle Input'),
+                       ('.pedal_output', 'orange', 'Throttle Output')]},
+        ],
+    },
+    'steering_report': {
+        'label': '🎛️ Steering Report Data',
+        'name': 'steering',
+        'columns': ['.steering_wheel_angle', '.steering_wheel_torque'],
+        'description': [
+            "Steering wheel angle in radians",
+            "Steering wheel command and torque",
+        ],
+        'derived': {
+            'steering_angle_deg': lambda df: np.degrees(df['.steering_wheel_angle']),
+        },
+        'metrics': {
+            '.steering_wheel_angle': ['max', 'min'],
+        },
+        'panels': [
+            {'title': 'Steering Wheel Angle', 'ylabel': 'Angle (degrees)',
+             'lines': [('steering_angle_deg', 'purple', 'Steering Angle')]},
+            {'title': 'Steering Torque', 'ylabel': 'Torque (Nm)',
+             'lines': [('.steering_wheel_torque', 'brown', 'Steering Torque')]},
+        ],
+    },
+    'wheel_speed_report': {
+        'label': '🔄 Wheel Speed Report Data',
+        'name': 'wheel',
+        'columns': ['.front_left', '.front_right', '.rear_left', '.rear_right'],
+        'description': [
+            "Individual wheel speeds for all 4 wheels (m/s)",
+        ],
+        'derived': {
+            'avg_speed': lambda df: df[['.front_left', '.front_right',
+                                        '.rear_left', '.rear_right']].mean(axis=1),
+        },
+        'metrics': {
+            '.front_left': ['max'],
+            '.front_right': ['max'],
+            '.rear_left': ['max'],
+            '.rear_right': ['max'],
+            'avg_speed': ['max'],
+        },
+        'panels': [
+            {'title': 'Wheel Speeds', 'ylabel': 'Speed (m/s)',
+             'lines': [('.front_left', 'r-', 'Front Left'),
+                       ('.front_right', 'b-', 'Front Right'),
+                       ('.rear_left', 'g-', 'Rear Left'),
+                       ('.rear_right', 'orange', 'Rear Right')]},
+        ],
+    },
+}
+
+# Cross-scenario overlays: (title, topic, column, ylabel)
+COMPARISONS = [
+    ('Comparison: Steering Angles', 'steering_report', 'steering_angle_deg', 'Angle (degrees)'),
+    ('Comparison: Average Vehicle Speed', 'wheel_speed_report', 'avg_speed', 'Speed (m/s)'),
+]
+
+# Bars in the summary chart: (metric column, legend label, scale)
+SUMMARY_BARS = [
+    ('wheel_speed_report.avg_speed.max', 'Max Speed (m/s)', 1),
+    ('brake_report.pedal_input.max', 'Max Brake (x10)', 10),
+]
+
+def find_topic_file(scenario_path, topic):
+    """Return the CSV for a topic inside a scenario directory."""
+    matches = sorted(glob.glob(os.path.join(scenario_path, f"*-vehicle-{topic}.csv")))
+    if not matches:
+        raise FileNotFoundError(f"no '*-vehicle-{topic}.csv' in {scenario_path}")
+    return matches[-1]
+
+def load_scenario(name, scenario_path):
+    """Load every topic of one scenario and compute its metrics.
+
+    Runs in a worker process, so only the columns needed for plotting are
+    kept and errors are returned instead of printed.
+    """
+    result = {'name': name, 'path': scenario_path, 'topics': {}, 'metrics': {}, 'errors': {}}
     
-    # 4. Steering Report Data
-    try:
-        steering_file = os.path.join(hardbrake_path, "2025-06-02-16-45-55-vehicle-steering_report.csv")
-        steering_data = pd.read_csv(steering_file)
-        
-        print(f"\n🎛️ Steering Report Data:")
-        print(f"   - Time range: {len(steering_data)} data points")
-        print(f"   - Steering wheel angle in radians")
-        print(f"   - Steering wheel command and torque")
-        print(f"   - Max steering angle: {steering_data['.steering_wheel_angle'].max():.3f} rad")
-        print(f"   - Min steering angle: {steering_data['.steering_wheel_angle'].min():.3f} rad")
-        
-        # Plot steering data
-        plt.subplot(6, 4, plot_num)
-        plt.plot(steering_data.index, np.degrees(steering_data['.steering_wheel_angle']), 'purple', label='Steering Angle', linewidth=2)
-        plt.title('Hard Brake: Steering Wheel Angle')
-        plt.xlabel('Time Index')
-        plt.ylabel('Angle (degrees)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-        plt.subplot(6, 4, plot_num)
-        plt.plot(steering_data.index, steering_data['.steering_wheel_torque'], 'brown', label='Steering Torque', linewidth=2)
-        plt.title('Hard Brake: Steering Torque')
-        plt.xlabel('Time Index')
-        plt.ylabel('Torque (Nm)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading steering data: {e}")
+    for topic, spec in TOPICS.items():
+        try:
+            df = pd.read_csv(find_topic_file(scenario_path, topic), usecols=spec['columns'])
+            for column, func in spec.get('derived', {}).items():
+                df[column] = func(df)
+            
+            stats = df[list(spec['metrics'])].agg(['max', 'min'])
+            for column, aggs in spec['metrics'].items():
+                for agg in aggs:
+                    result['metrics'][f"{topic}{'' if column.startswith('.') else '.'}{column}.{agg}"] = stats.at[agg, column]
+            
+            result['topics'][topic] = df
+        except Exception as e:
+            result['errors'][topic] = str(e)
     
-    # 5. Wheel Speed Report Data
-    try:
-        wheel_file = os.path.join(hardbrake_path, "2025-06-02-16-45-55-vehicle-wheel_speed_report.csv")
-        wheel_data = pd.read_csv(wheel_file)
-        
-        print(f"\n🔄 Wheel Speed Report Data:")
-        print(f"   - Time range: {len(wheel_data)} data points")
-        print(f"   - Individual wheel speeds for all 4 wheels (m/s)")
-        print(f"   - Front Left max: {wheel_data['.front_left'].max():.2f} m/s")
-        print(f"   - Front Right max: {wheel_data['.front_right'].max():.2f} m/s")
-        print(f"   - Rear Left max: {wheel_data['.rear_left'].max():.2f} m/s")
-        print(f"   - Rear Right max: {wheel_data['.rear_right'].max():.2f} m/s")
-        
-        # Plot wheel speeds
-        plt.subplot(6, 4, plot_num)
-        plt.plot(wheel_data.index, wheel_data['.front_left'], 'r-', label='Front Left', linewidth=2)
-        plt.plot(wheel_data.index, wheel_data['.front_right'], 'b-', label='Front Right', linewidth=2)
-        plt.plot(wheel_data.index, wheel_data['.rear_left'], 'g-', label='Rear Left', linewidth=2)
-        plt.plot(wheel_data.index, wheel_data['.rear_right'], 'orange', label='Rear Right', linewidth=2)
-        plt.title('Hard Brake: Wheel Speeds')
-        plt.xlabel('Time Index')
-        plt.ylabel('Speed (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading wheel speed data: {e}")
+    return result
+
+def compare_scenarios(scenarios, max_workers=None):
+    """Load all scenarios in parallel and build the comparison table.
+
+    Args:
+        scenarios (dict): Display name -> scenario directory
+        max_workers (int): Process pool size (defaults to CPU count)
+
+    Returns:
+        tuple: (list of per-scenario results, DataFrame of metrics indexed by scenario)
+    """
+    names = list(scenarios)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(load_scenario, names, [scenarios[n] for n in names]))
     
-    # ===== SUDDEN TURN DATA ANALYSIS =====
-    print("\n\n🌀 SUDDEN TURN SCENARIO DATA:")
+    table = pd.DataFrame([r['metrics'] for r in results], index=names)
+    return results, table
+
+def print_scenario(result, table):
+    """Print the per-topic summary for one scenario."""
+    print(f"\n\n🚗 {result['name'].upper()} SCENARIO DATA:")
     print("-" * 50)
     
-    # 1. GPS Velocity Data - Sudden Turn
-    try:
-        gps_file_st = os.path.join(suddenturn_path, "2025-06-02-16-46-24-vehicle-gps-vel.csv")
-        gps_data_st = pd.read_csv(gps_file_st)
-        
-        print(f"📍 GPS Velocity Data:")
-        print(f"   - Time range: {len(gps_data_st)} data points")
-        print(f"   - Max linear velocity: X={gps_data_st['.twist.linear.x'].max():.2f}, Y={gps_data_st['.twist.linear.y'].max():.2f}")
-        
-        # Plot GPS velocity - Sudden Turn
-        plt.subplot(6, 4, plot_num)
-        plt.plot(gps_data_st.index, gps_data_st['.twist.linear.x'], 'r-', label='Linear X', linewidth=2)
-        plt.plot(gps_data_st.index, gps_data_st['.twist.linear.y'], 'g-', label='Linear Y', linewidth=2)
-        plt.plot(gps_data_st.index, gps_data_st['.twist.linear.z'], 'b-', label='Linear Z', linewidth=2)
-        plt.title('Sudden Turn: GPS Linear Velocity')
-        plt.xlabel('Time Index')
-        plt.ylabel('Velocity (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading GPS data: {e}")
-    
-    # 2. Brake Report Data - Sudden Turn
-    try:
-        brake_file_st = os.path.join(suddenturn_path, "2025-06-02-16-46-24-vehicle-brake_report.csv")
-        brake_data_st = pd.read_csv(brake_file_st)
-        
-        print(f"\n🛑 Brake Report Data:")
-        print(f"   - Time range: {len(brake_data_st)} data points")
-        print(f"   - Max pedal input: {brake_data_st['.pedal_input'].max():.3f}")
-        
-        # Plot brake data - Sudden Turn
-        plt.subplot(6, 4, plot_num)
-        plt.plot(brake_data_st.index, brake_data_st['.pedal_input'], 'r-', label='Pedal Input', linewidth=2)
-        plt.plot(brake_data_st.index, brake_data_st['.pedal_output'], 'b-', label='Pedal Output', linewidth=2)
-        plt.title('Sudden Turn: Brake Pedal')
-        plt.xlabel('Time Index')
-        plt.ylabel('Pedal Position (0-1)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading brake data: {e}")
-    
-    # 3. Throttle Report Data - Sudden Turn
-    try:
-        throttle_file_st = os.path.join(suddenturn_path, "2025-06-02-16-46-24-vehicle-throttle_report.csv")
-        throttle_data_st = pd.read_csv(throttle_file_st)
-        
-        print(f"\n⚡ Throttle Report Data:")
-        print(f"   - Time range: {len(throttle_data_st)} data points")
-        print(f"   - Max pedal input: {throttle_data_st['.pedal_input'].max():.3f}")
-        
-        # Plot throttle data - Sudden Turn
-        plt.subplot(6, 4, plot_num)
-        plt.plot(throttle_data_st.index, throttle_data_st['.pedal_input'], 'g-', label='Throttle Input', linewidth=2)
-        plt.plot(throttle_data_st.index, throttle_data_st['.pedal_output'], 'orange', label='Throttle Output', linewidth=2)
-        plt.title('Sudden Turn: Throttle Pedal')
-        plt.xlabel('Time Index')
-        plt.ylabel('Pedal Position (0-1)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading throttle data: {e}")
+    metrics = table.loc[result['name']]
+    for topic, spec in TOPICS.items():
+        print(f"\n{spec['label']}:")
+        if topic in result['errors']:
+            print(f"   ❌ Error reading {spec['name']} data: {result['errors'][topic]}")
+            continue
+        
+        print(f"   - Time range: {len(result['topics'][topic])} data points")
+        for line in spec['description']:
+            print(f"   - {line}")
+        for key in metrics.index:
+            if key.startswith(f"{topic}."):
+                print(f"   - {key[len(topic) + 1:]}: {metrics[key]:.3f}")
+
+def analyze_data_files(scenarios=None, max_workers=None):
+    """Analyze and visualize all vehicle data files"""
+    if scenarios is None:
+        scenarios = SCENARIOS
     
-    # 4. Steering Report Data - Sudden Turn
-    try:
-        steering_file_st = os.path.join(suddenturn_path, "2025-06-02-16-46-24-vehicle-steering_report.csv")
-        steering_data_st = pd.read_csv(steering_file_st)
-        
-        print(f"\n🎛️ Steering Report Data:")
-        print(f"   - Time range: {len(steering_data_st)} data points")
-        print(f"   - Max steering angle: {steering_data_st['.steering_wheel_angle'].max():.3f} rad")
-        print(f"   - Min steering angle: {steering_data_st['.steering_wheel_angle'].min():.3f} rad")
-        
-        # Plot steering data - Sudden Turn
-        plt.subplot(6, 4, plot_num)
-        plt.plot(steering_data_st.index, np.degrees(steering_data_st['.steering_wheel_angle']), 'purple', label='Steering Angle', linewidth=2)
-        plt.title('Sudden Turn: Steering Wheel Angle')
-        plt.xlabel('Time Index')
-        plt.ylabel('Angle (degrees)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-        plt.subplot(6, 4, plot_num)
-        plt.plot(steering_data_st.index, steering_data_st['.steering_wheel_torque'], 'brown', label='Steering Torque', linewidth=2)
-        plt.title('Sudden Turn: Steering Torque')
-        plt.xlabel('Time Index')
-        plt.ylabel('Torque (Nm)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading steering data: {e}")
+    print("="*80)
+    print("VEHICLE DATA ANALYSIS REPORT")
+    print("="*80)
     
-    # 5. Wheel Speed Report Data - Sudden Turn
-    try:
-        wheel_file_st = os.path.join(suddenturn_path, "2025-06-02-16-46-24-vehicle-wheel_speed_report.csv")
-        wheel_data_st = pd.read_csv(wheel_file_st)
-        
-        print(f"\n🔄 Wheel Speed Report Data:")
-        print(f"   - Time range: {len(wheel_data_st)} data points")
-        print(f"   - Front Left max: {wheel_data_st['.front_left'].max():.2f} m/s")
-        print(f"   - Front Right max: {wheel_data_st['.front_right'].max():.2f} m/s")
-        print(f"   - Rear Left max: {wheel_data_st['.rear_left'].max():.2f} m/s")
-        print(f"   - Rear Right max: {wheel_data_st['.rear_right'].max():.2f} m/s")
-        
-        # Plot wheel speeds - Sudden Turn
-        plt.subplot(6, 4, plot_num)
-        plt.plot(wheel_data_st.index, wheel_data_st['.front_left'], 'r-', label='Front Left', linewidth=2)
-        plt.plot(wheel_data_st.index, wheel_data_st['.front_right'], 'b-', label='Front Right', linewidth=2)
-        plt.plot(wheel_data_st.index, wheel_data_st['.rear_left'], 'g-', label='Rear Left', linewidth=2)
-        plt.plot(wheel_data_st.index, wheel_data_st['.rear_right'], 'orange', label='Rear Right', linewidth=2)
-        plt.title('Sudden Turn: Wheel Speeds')
-        plt.xlabel('Time Index')
-        plt.ylabel('Speed (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-        
-    except Exception as e:
-        print(f"   ❌ Error reading wheel speed data: {e}")
+    results, table = compare_scenarios(scenarios, max_workers=max_workers)
+    for result in results:
+        print_scenario(result, table)
     
-    # Add remaining subplots for comparison charts
-    # Comparison plot - Steering angles
-    try:
-        plt.subplot(6, 4, plot_num)
-        plt.plot(np.degrees(steering_data['.steering_wheel_angle']), 'b-', label='Hard Brake', linewidth=2, alpha=0.7)
-        plt.plot(np.degrees(steering_data_st['.steering_wheel_angle']), 'r-', label='Sudden Turn', linewidth=2, alpha=0.7)
-        plt.title('Comparison: Steering Angles')
-        plt.xlabel('Time Index')
-        plt.ylabel('Angle (degrees)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-    except:
-        pass
+    # One panel per (scenario, topic panel), then the comparisons and summary.
+    # Panels render independently and are cached by content, so adding a
+    # scenario only renders that scenario's panels and the comparisons.
+    panels = []
+    for result in results:
+        for topic, spec in TOPICS.items():
+            if topic not in result['topics']:
+                continue
+            df = result['topics'][topic]
+            for panel in spec['panels']:
+                lines = [(df.index, df[col], style, {'label': label, 'linewidth': 2})
+                         for col, style, label in panel['lines']]
+                panels.append(line_panel(f"{result['name']}: {panel['title']}", 'Time Index',
+                                         panel['ylabel'], lines, dpi=SAVE_DPI))
     
-    # Comparison plot - Vehicle speeds (average of all wheels)
-    try:
-        plt.subplot(6, 4, plot_num)
-        avg_speed_hb = (wheel_data['.front_left'] + wheel_data['.front_right'] + 
-                       wheel_data['.rear_left'] + wheel_data['.rear_right']) / 4
-        avg_speed_st = (wheel_data_st['.front_left'] + wheel_data_st['.front_right'] + 
-                       wheel_data_st['.rear_left'] + wheel_data_st['.rear_right']) / 4
-        
-        plt.plot(avg_speed_hb, 'b-', label='Hard Brake', linewidth=2, alpha=0.7)
-        plt.plot(avg_speed_st, 'r-', label='Sudden Turn', linewidth=2, alpha=0.7)
-        plt.title('Comparison: Average Vehicle Speed')
-        plt.xlabel('Time Index')
-        plt.ylabel('Speed (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-    except:
-        pass
+    for title, topic, column, ylabel in COMPARISONS:
+        lines = [(r['topics'][topic].index, r['topics'][topic][column], '-',
+                  {'label': r['name'], 'linewidth': 2, 'alpha': 0.7})
+                 for r in results if topic in r['topics']]
+        if lines:
+            panels.append(line_panel(title, 'Time Index', ylabel, lines, dpi=SAVE_DPI))
     
     # Summary Statistics Plot
-    try:
-        plt.subplot(6, 4, plot_num)
-        scenarios = ['Hard Brake', 'Sudden Turn']
-        max_speeds = [avg_speed_hb.max(), avg_speed_st.max()]
-        max_brake = [brake_data['.pedal_input'].max(), brake_data_st['.pedal_input'].max()]
-        
-        x = np.arange(len(scenarios))
-        width = 0.35
-        
-        plt.bar(x - width/2, max_speeds, width, label='Max Speed (m/s)', alpha=0.8)
-        plt.bar(x + width/2, [b*10 for b in max_brake], width, label='Max Brake (x10)', alpha=0.8)
-        
-        plt.title('Scenario Comparison')
-        plt.xlabel('Scenarios')
-        plt.ylabel('Values')
-        plt.xticks(x, scenarios)
-        plt.legend()
-        plt.grid(True)
-        plot_num += 1
-    except:
-        pass
+    bars = [(table[col] * scale, label) for col, label, scale in SUMMARY_BARS if col in table.columns]
+    if bars:
+        panels.append(bar_panel('Scenario Comparison', 'Scenarios', 'Values', table.index, bars))
     
-    # Adjust layout and save
-    plt.tight_layout()
-    plt.savefig('vehicle_data_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    _, rendered, cached = render_report(panels, 'vehicle_data_analysis.png', ncols=4, dpi=SAVE_DPI,
+                                        palette=sns.color_palette(), max_workers=max_workers)
+    print(f"\n🖼️ Rendered {rendered} panels ({cached} reused from cache)")
     
     print("\n" + "="*80)
-    print("SUMMARY OF VEHICLE DATA FILES:")
+    print("SCENARIO COMPARISON TABLE:")
     print("="*80)
+    print(table.T.to_string(float_format=lambda v: f"{v:.3f}"))
     
     print("\n📊 DATA FILE DESCRIPTIONS:")
     print("1. 📍 GPS Velocity Files:")
@@ -416,4 +296,8 @@ def analyze_data_files():
     print("="*80)
 
 if __name__ == "__main__":
-    analyze_data_files()
\ No newline at end of file
+    # Optional scenario directories on the command line, named by folder
+    if len(sys.argv) > 1:
+        analyze_data_files({os.path.basename(os.path.normpath(p)): p for p in sys.argv[1:]})
+    else:
+        analyze_data_files()
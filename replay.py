@@ -0,0 +1,171 @@
+import os
+import argparse
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Line formats printed by the Arduino sketches
+#   'brace': gyro_accel_arduino.ino   {ax:0.12,ay:-0.03,az:9.81,gx:0.35,gy:-0.18,gz:0.00}
+#   'text':  ultrasound+gyro.ino      Dist(cm): 42.0  |  Acc(m/s2): 0.12, -0.03, 9.81  |  Gyro(dps): 0.4, -0.2, 0.0
+LINE_FORMATS = ('brace', 'text')
+
+def _read_table(path):
+    """Read a CSV or Parquet file by extension."""
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def load_drive(gyro_file='gyro_processed.csv', accel_file='accel_processed.csv', tolerance=0.05):
+    """
+    Load a recorded drive as one table in the units the Arduino prints.
+    Gyro and accel files (time_combined plus gyro_x/y/z in rad/s and
+    accel_x/y/z in m/s²) are aligned on time with merge_asof; gyro rows
+    drive the timeline. With accel_file=None, gyro_file must hold both.
+
+    Returns:
+        DataFrame: time (s), ax, ay, az (m/s²), gx, gy, gz (dps), and
+        dist (cm, NaN = out of range) when the recording has a distance column
+    """
+    gyro = _read_table(gyro_file).sort_values('time_combined')
+    if accel_file is None:
+        data = gyro
+    else:
+        accel = _read_table(accel_file).sort_values('time_combined')
+        data = pd.merge_asof(gyro, accel, on='time_combined', direction='nearest', tolerance=tolerance)
+
+    drive = pd.DataFrame({'time': data['time_combined'].to_numpy(dtype=float)})
+    for axis in 'xyz':
+        drive[f'a{axis}'] = data[f'accel_{axis}'].to_numpy(dtype=float)
+    for axis in 'xyz':
+        drive[f'g{axis}'] = np.degrees(data[f'gyro_{axis}'].to_numpy(dtype=float))
+    for column in ('distance', 'dist', 'distance_cm'):
+        if column in data:
+            drive['dist'] = data[column].to_numpy(dtype=float)
+            break
+    return drive.dropna(subset=['ax', 'ay', 'az']).reset_index(drop=True)
+
+def format_lines(drive, fmt='brace'):
+    """Render every row of a drive as the serial line the Arduino would print (bytes, CRLF)."""
+    if fmt == 'brace':
+        template = '{{ax:{:.2f},ay:{:.2f},az:{:.2f},gx:{:.2f},gy:{:.2f},gz:{:.2f}}}\r\n'
+        rows = drive[['ax', 'ay', 'az', 'gx', 'gy', 'gz']].itertuples(index=False, name=None)
+        return [template.format(*row).encode() for row in rows]
+    if fmt == 'text':
+        dist = drive['dist'].to_numpy() if 'dist' in drive else np.full(len(drive), np.nan)
+        lines = []
+        rows = drive[['ax', 'ay', 'az', 'gx', 'gy', 'gz']].itertuples(index=False, name=None)
+        for d, (ax, ay, az, gx, gy, gz) in zip(dist, rows):
+            distance = 'Out of range' if not d >= 0 else f'{d:.1f}'
+            lines.append(f'Dist(cm): {distance}  |  Acc(m/s2): {ax:.2f}, {ay:.2f}, {az:.2f}'
+                         f'  |  Gyro(dps): {gx:.1f}, {gy:.1f}, {gz:.1f}\r\n'.encode())
+        return lines
+    raise ValueError(f"Unknown line format {fmt!r}, expected one of {LINE_FORMATS}")
+
+class ReplaySerial:
+    """
+    Stand-in for serial.Serial that plays a recorded drive back as Arduino lines.
+    readline() blocks until the line's recorded time comes due, scheduled
+    against the monotonic clock from the start of playback (no drift from
+    accumulated sleeps). speed=1 is real time, N is N× faster, 0 is as
+    fast as the reader can take lines (load testing). Thread-safe: several
+    readers share one playback position like they would share a port.
+    """
+
+    def __init__(self, gyro_file='gyro_processed.csv', accel_file='accel_processed.csv',
+                 speed=1.0, loop=False, fmt='brace', start_time=None, end_time=None):
+        drive = load_drive(gyro_file, accel_file)
+        if start_time is not None:
+            drive = drive[drive['time'] >= start_time]
+        if end_time is not None:
+            drive = drive[drive['time'] <= end_time]
+        if drive.empty:
+            raise ValueError("Nothing to replay in the selected time range")
+
+        self.times = drive['time'].to_numpy() - drive['time'].iloc[0]
+        self.lines = format_lines(drive, fmt)
+        self.speed = speed
+        self.loop = loop
+        self.is_open = True
+        self._lock = threading.Lock()
+        self._pos = 0
+        self._t0 = None
+        self._loop_offset = 0.0
+
+    def _due(self, pos):
+        """Monotonic time at which line pos is due."""
+        return self._t0 + (self._loop_offset + self.times[pos]) / self.speed
+
+    def readline(self):
+        """Next line (bytes ending in CRLF); b'' and is_open False once a non-looping replay has finished."""
+        with self._lock:
+            if not self.is_open:
+                return b''
+            if self._pos == len(self.lines):
+                if not self.loop:
+                    self.is_open = False
+                    return b''
+                # Next pass starts one median sample period after the last line
+                period = float(np.median(np.diff(self.times))) if len(self.times) > 1 else 0.0
+                self._loop_offset += self.times[-1] + period
+                self._pos = 0
+            if self._t0 is None:
+                self._t0 = time.monotonic()
+            pos = self._pos
+            self._pos += 1
+            delay = self._due(pos) - time.monotonic() if self.speed > 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return self.lines[pos]
+
+    def readlines(self):
+        return list(iter(self.readline, b''))
+
+    def close(self):
+        self.is_open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"ReplaySerial({len(self.lines)} lines, speed={self.speed}, loop={self.loop})"
+
+def add_replay_arguments(parser, default_format='brace'):
+    """Command-line options shared by the servers for replaying a recording instead of a port."""
+    parser.add_argument('--replay', nargs='+', metavar='FILE',
+                        help="Replay a recorded drive instead of the serial port: GYRO_FILE [ACCEL_FILE] "
+                             "(CSV or Parquet; one file must then hold both)")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Replay speed: 1 = real time, N = N× faster, 0 = as fast as possible")
+    parser.add_argument('--loop', action='store_true', help="Restart the replay when it reaches the end")
+    parser.add_argument('--format', dest='line_format', choices=LINE_FORMATS, default=default_format,
+                        help="Arduino line format to emit during replay")
+
+def open_replay(args):
+    """ReplaySerial from parsed add_replay_arguments() options."""
+    gyro_file = args.replay[0]
+    accel_file = args.replay[1] if len(args.replay) > 1 else None
+    return ReplaySerial(gyro_file, accel_file, speed=args.speed, loop=args.loop, fmt=args.line_format)
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a recorded drive as Arduino serial lines")
+    add_replay_arguments(parser)
+    args = parser.parse_args()
+    if not args.replay:
+        parser.error("--replay is required")
+
+    source = open_replay(args)
+    print(f"▶️  {source}")
+    start = time.monotonic()
+    n = 0
+    for line in iter(source.readline, b''):
+        print(line.decode().rstrip())
+        n += 1
+    elapsed = time.monotonic() - start
+    print(f"✅ Replayed {n} lines in {elapsed:.2f} s ({n / max(elapsed, 1e-9):.0f} lines/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+import os
+import argparse
+import select
+import socket
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from replay import ReplaySerial, add_replay_arguments, open_replay
+
+SERIAL_PORT = '/dev/tty.usbmodem11301'  # Replace with your port
+BAUDRATE = 115200
+
+class SerialSource:
+    """
+    Byte stream from the sensor, whatever carries it.
+    Backends only implement _read_into(); callers get batched reads into a
+    reusable buffer (read_batch returns a memoryview, no copy per line) and
+    a selectable fileno(). EOF closes the source (is_open goes False).
+    """
+
+    def __init__(self, timeout=1.0):
+        self.timeout = timeout
+        self.is_open = True
+        self.bytes_read = 0
+
+    def fileno(self):
+        raise NotImplementedError
+
+    def _read_into(self, view):
+        """Read available bytes into view; return the count, 0 at EOF."""
+        raise NotImplementedError
+
+    def read_into(self, view):
+        """
+        Wait up to timeout for data, then read whatever is available
+        (at most len(view)) in one call. Returns 0 on timeout or EOF.
+        """
+        if not self.is_open:
+            return 0
+        ready, _, _ = select.select([self], [], [], self.timeout)
+        if not ready:
+            return 0
+        return self.read_available(view)
+
+    def read_available(self, view):
+        """Read without waiting, for callers that already selected on fileno()."""
+        if not self.is_open:
+            return 0
+        n = self._read_into(view)
+        if n == 0:
+            self.close()
+        self.bytes_read += n
+        return n
+
+    def read_batch(self, buffer, wait=True):
+        """read_into(buffer) (or read_available), returned as a memoryview of the filled part."""
+        view = memoryview(buffer)
+        return view[:self.read_into(view) if wait else self.read_available(view)]
+
+    def close(self):
+        self.is_open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class FdSource(SerialSource):
+    """Source over a readable file descriptor (pty master, pipe, serial device)."""
+
+    def __init__(self, fd, timeout=1.0):
+        super().__init__(timeout)
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def _read_into(self, view):
+        try:
+            return os.readv(self.fd, [view])
+        except OSError:
+            # A pty master reports EIO once the writer side is gone
+            return 0
+
+    def close(self):
+        if self.is_open:
+            os.close(self.fd)
+        super().close()
+
+class PortSource(FdSource):
+    """A real serial port (pyserial configures it; reads go straight to its fd)."""
+
+    def __init__(self, port=SERIAL_PORT, baudrate=BAUDRATE, timeout=1.0):
+        import serial
+        self.serial = serial.Serial(port, baudrate, timeout=0)
+        super().__init__(self.serial.fileno(), timeout)
+
+    def close(self):
+        if self.is_open:
+            self.serial.close()
+        SerialSource.close(self)
+
+    def __repr__(self):
+        return f"PortSource({self.serial.port!r}, {self.serial.baudrate})"
+
+class PtySource(FdSource):
+    """
+    A pseudo-terminal: anything written to slave_name (an Arduino
+    emulator, `cat log > /dev/pts/N`, a benchmark feeder) is read here.
+    """
+
+    def __init__(self, timeout=1.0):
+        master, slave = os.openpty()
+        self.slave_fd = slave
+        self.slave_name = os.ttyname(slave)
+        # Raw mode, so lines arrive byte-for-byte like from the USB port
+        import tty
+        tty.setraw(slave)
+        super().__init__(master, timeout)
+
+    def close(self):
+        if self.is_open:
+            os.close(self.slave_fd)
+        super().close()
+
+    def __repr__(self):
+        return f"PtySource({self.slave_name})"
+
+class TcpSource(SerialSource):
+    """A TCP stream, e.g. a serial-to-network bridge (ser2net, ESP32 WiFi)."""
+
+    def __init__(self, host, port, timeout=1.0):
+        super().__init__(timeout)
+        self.address = (host, port)
+        self.sock = socket.create_connection(self.address, timeout=10)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def _read_into(self, view):
+        try:
+            return self.sock.recv_into(view)
+        except OSError:
+            return 0
+
+    def close(self):
+        if self.is_open:
+            self.sock.close()
+        super().close()
+
+    def __repr__(self):
+        return f"TcpSource({self.address[0]}:{self.address[1]})"
+
+class ReplaySource(FdSource):
+    """
+    A ReplaySerial recording fed through a pipe by a writer thread, so
+    replay has a real fd and the same read path as the hardware backends.
+    """
+
+    def __init__(self, replay, timeout=1.0):
+        read_fd, self._write_fd = os.pipe()
+        super().__init__(read_fd, timeout)
+        self.replay = replay
+        self._writer = threading.Thread(target=self._feed, daemon=True)
+        self._writer.start()
+
+    def _feed(self):
+        try:
+            for line in iter(self.replay.readline, b''):
+                os.write(self._write_fd, line)
+        except OSError:
+            pass  # reader closed
+        finally:
+            os.close(self._write_fd)
+
+    def close(self):
+        self.replay.close()
+        super().close()
+
+    def __repr__(self):
+        return f"ReplaySource({self.replay})"
+
+def open_source(spec, timeout=1.0):
+    """
+    Open a source from a spec string:
+
+        /dev/tty.usbmodem11301                    serial port (baud 115200)
+        serial:///dev/ttyACM0?baud=9600           serial port
+        pty:                                      new pseudo-terminal
+        tcp://192.168.4.1:2000                    TCP stream
+        replay:gyro.csv,accel.csv?speed=2&loop=1&format=text
+                                                  recorded drive (see replay.py)
+    """
+    if spec.startswith('/'):
+        return PortSource(spec, timeout=timeout)
+    parts = urlsplit(spec)
+    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    if parts.scheme == 'serial':
+        return PortSource(parts.path, int(query.get('baud', BAUDRATE)), timeout=timeout)
+    if parts.scheme == 'pty':
+        return PtySource(timeout=timeout)
+    if parts.scheme == 'tcp':
+        return TcpSource(parts.hostname, parts.port, timeout=timeout)
+    if parts.scheme == 'replay':
+        files = parts.path.split(',')
+        replay = ReplaySerial(files[0], files[1] if len(files) > 1 else None,
+                              speed=float(query.get('speed', 1.0)),
+                              loop=query.get('loop', '0') not in ('0', 'false', ''),
+                              fmt=query.get('format', 'brace'))
+        return ReplaySource(replay, timeout=timeout)
+    raise ValueError(f"Unknown source {spec!r}")
+
+class LineReader:
+    """
+    Splits a SerialSource's batched reads into lines.
+    lines() hands back every complete line of one read at once; readline()
+    keeps the serial.Serial interface the servers were written against.
+    """
+
+    def __init__(self, source, bufsize=1 << 16):
+        self.source = source
+        self._buffer = bytearray(bufsize)
+        self._partial = b''
+        self._pending = []
+        self._lock = threading.Lock()
+        self._last_read_ns = time.monotonic_ns()
+
+    @property
+    def is_open(self):
+        return self.source.is_open or bool(self._pending)
+
+    def lines(self, wait=True):
+        """
+        Complete lines (bytes, without line endings) from one batch read;
+        [] on timeout. wait=False reads straight away (fileno() is ready).
+        """
+        batch = self.source.read_batch(self._buffer, wait)
+        if not batch:
+            if not self.source.is_open and self._partial:
+                last, self._partial = self._partial, b''
+                return [last.rstrip(b'\r')]
+            return []
+        chunks = (self._partial + batch).split(b'\n') if self._partial else bytes(batch).split(b'\n')
+        self._partial = chunks.pop()
+        return [c.rstrip(b'\r') for c in chunks]
+
+    def stamped_lines(self, wait=True):
+        """
+        lines() plus each line's arrival time, as (lines, wall times in s,
+        monotonic times in ns). One read returns every line that came in
+        since the previous read (timeouts included, so at most the read
+        timeout ago), so rather than all sharing this read's clock they are
+        spread evenly over that interval, the last one now.
+        """
+        lines = self.lines(wait)
+        now_ns, now = time.monotonic_ns(), time.time()
+        since_ns, self._last_read_ns = self._last_read_ns, now_ns
+        n = len(lines)
+        t_ns = [now_ns - (now_ns - since_ns) * (n - 1 - i) // n for i in range(n)]
+        return lines, [now - (now_ns - stamp) / 1e9 for stamp in t_ns], t_ns
+
+    def readline(self):
+        """Next line including its newline, b'' on timeout or end of stream."""
+        with self._lock:
+            while not self._pending:
+                lines = self.lines()
+                if not lines:
+                    return b''
+                self._pending = lines[::-1]
+            return self._pending.pop() + b'\n'
+
+    def close(self):
+        self.source.close()
+
+def add_source_arguments(parser, default_source=SERIAL_PORT, default_format='brace'):
+    """--source SPEC plus the replay shortcuts (--replay FILE... --speed --loop --format)."""
+    parser.add_argument('--source', default=default_source,
+                        help="Where sensor lines come from: a serial device, serial://DEV?baud=N, "
+                             "pty:, tcp://HOST:PORT or replay:GYRO[,ACCEL]?speed=N (see serial_sources.py)")
+    add_replay_arguments(parser, default_format)
+
+def source_from_args(args, timeout=1.0):
+    """Open the source selected by add_source_arguments() options."""
+    if args.replay:
+        return ReplaySource(open_replay(args), timeout=timeout)
+    return open_source(args.source, timeout=timeout)
+
+def main():
+    """Throughput benchmark: read a source until it ends (or --seconds pass) and report rates."""
+    parser = argparse.ArgumentParser(description="Benchmark reading lines from a sensor source")
+    parser.add_argument('source', help="Source spec, e.g. replay:gyro.csv,accel.csv?speed=0 or pty:")
+    parser.add_argument('--seconds', type=float, default=10.0, help="Stop after this long")
+    parser.add_argument('--bufsize', type=int, default=1 << 16, help="Batch read buffer size")
+    args = parser.parse_args()
+
+    source = open_source(args.source)
+    if isinstance(source, PtySource):
+        print(f"🔌 Write lines to {source.slave_name}")
+    reader = LineReader(source, args.bufsize)
+    print(f"▶️  {source}")
+
+    n_lines = n_reads = 0
+    start = time.monotonic()
+    while reader.is_open and time.monotonic() - start < args.seconds:
+        lines = reader.lines()
+        n_reads += bool(lines)
+        n_lines += len(lines)
+    elapsed = time.monotonic() - start
+    reader.close()
+
+    print(f"✅ {n_lines} lines, {source.bytes_read / 1e6:.2f} MB in {elapsed:.2f} s")
+    print(f"   {n_lines / elapsed:,.0f} lines/s, {source.bytes_read / 1e6 / elapsed:.2f} MB/s, "
+          f"{n_lines / max(n_reads, 1):.1f} lines per read")
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,64 @@
-from flask import Flask, Response, send_from_directory
-import serial
+from flask import Flask, Response, request, jsonify
+import argparse
+import threading
 import os
 
+from serial_sources import LineReader, add_source_arguments, source_from_args
+from telemetry import parse_line
+from broadcast import Broadcaster, parse_view_args
+from static_assets import StaticAsset
+
 app = Flask(__name__)
-ser = serial.Serial('/dev/tty.usbmodem11301', 115200)  # Replace with your port
+
+# Filled by read_serial() from the Arduino port, a pty, TCP or a replay;
+# every /data client subscribes to it instead of reading the port itself
+broadcaster = Broadcaster()
+
+def read_serial(reader):
+    """Parse each batch of lines once and publish the samples."""
+    while reader.is_open:
+        lines, t, _ = reader.stamped_lines()
+        samples = [parse_line(line, t=line_t) for line, line_t in zip(lines, t)]
+        broadcaster.publish([s for s in samples if s is not None])
+    broadcaster.flush()
+
+VIEW_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'serial_view.html')
+# Read and compressed once; the debug reloader restarts the server when it changes
+view_page = StaticAsset.from_file(VIEW_PATH)
 
 @app.route('/')
 def index():
-    return send_from_directory(os.path.dirname(__file__), 'serial_view.html')
+    return view_page.response(request)
 
 @app.route('/data')
 def stream():
-    def generate():
-        while True:
-            line = ser.readline().decode('utf-8')
-            yield f"data:{line}\n\n"
-    return Response(generate(), mimetype='text/event-stream')
+    """
+    Samples as schema-versioned JSON (see telemetry.py). ?rate=N limits the
+    stream to N events/s, ?agg=latest|mean|minmax picks how each window is
+    reduced (see broadcast.Decimator); without rate every sample is sent.
+    ?batch=MS packs the samples of each MS window into one columnar event.
+    ?policy=drop_oldest|latest|disconnect&buffer=N handles slow clients.
+    """
+    try:
+        view = parse_view_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    events = broadcaster.stream(last_id=request.headers.get('Last-Event-ID'), **view)
+    return Response(events, mimetype='text/event-stream')
+
+@app.route('/stats')
+def stats():
+    """Per-client sent/dropped counters and totals per backpressure policy"""
+    return jsonify(broadcaster.stats())
 
 if __name__ == '__main__':
-    app.run(debug=True, threaded=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Stream Arduino serial lines to serial_view.html")
+    add_source_arguments(parser)
+    args = parser.parse_args()
+
+    # With debug=True the reloader runs this script twice; only the serving
+    # child (WERKZEUG_RUN_MAIN) should open the source
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        reader = LineReader(source_from_args(args))
+        threading.Thread(target=read_serial, args=(reader,), daemon=True).start()
+    app.run(debug=True, threaded=True, extra_files=[VIEW_PATH])
@@ -0,0 +1,198 @@
+import argparse
+import math
+import signal
+import sys
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+from serial_sources import LineReader, add_source_arguments, source_from_args
+from telemetry import Sample, parse_line
+
+# One fixed-size record per serial line: parsed values (NaN when the line
+# is not a reading) plus the raw line, truncated to LINE_BYTES
+LINE_BYTES = 104
+RING_DTYPE = np.dtype([
+    ('seq', '<u8'),      # 1-based position in the stream; detects overwritten slots
+    ('t', '<f8'),        # arrival wall time (s)
+    ('t_ns', '<i8'),     # arrival monotonic time (ns), shared by all processes
+    ('ax', '<f4'), ('ay', '<f4'), ('az', '<f4'),
+    ('gx', '<f4'), ('gy', '<f4'), ('gz', '<f4'),
+    ('dist', '<f4'),
+    ('line', f'S{LINE_BYTES}'),
+])
+RING_VERSION = 1
+HEADER_BYTES = 64
+# Header int64 slots
+_COMMITTED, _STARTED, _CAPACITY, _ITEMSIZE, _VERSION = range(5)
+
+class ShmRing:
+    """
+    Single-writer, many-reader ring of RING_DTYPE records in shared memory.
+    The writer bumps STARTED, copies a batch into its slots, then bumps
+    COMMITTED. Readers copy what is committed and afterwards drop any
+    record the writer may have started overwriting meanwhile (a seqlock),
+    so they never block the writer and never see torn records.
+    """
+
+    def __init__(self, name=None, capacity=8192, create=True):
+        size = HEADER_BYTES + capacity * RING_DTYPE.itemsize
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        self.name = self.shm.name
+        self._header = np.ndarray((HEADER_BYTES // 8,), dtype='<i8', buffer=self.shm.buf)
+        if create:
+            self._header[:] = 0
+            self._header[_CAPACITY] = capacity
+            self._header[_ITEMSIZE] = RING_DTYPE.itemsize
+            self._header[_VERSION] = RING_VERSION
+        elif self._header[_VERSION] != RING_VERSION or self._header[_ITEMSIZE] != RING_DTYPE.itemsize:
+            raise ValueError(f"Shared memory {name!r} does not hold a version {RING_VERSION} ring")
+        self.capacity = int(self._header[_CAPACITY])
+        self.records = np.ndarray((self.capacity,), dtype=RING_DTYPE, buffer=self.shm.buf, offset=HEADER_BYTES)
+        self.owner = create
+
+    @classmethod
+    def attach(cls, name):
+        return cls(name, create=False)
+
+    def head(self):
+        """Number of records committed so far."""
+        return int(self._header[_COMMITTED])
+
+    def write(self, rows):
+        """Append a batch of RING_DTYPE rows (structured array or tuples; 'seq' is filled in)."""
+        batch = np.asarray(rows, dtype=RING_DTYPE) if not isinstance(rows, np.ndarray) else rows
+        n = len(batch)
+        if n == 0:
+            return
+        head = self.head()
+        if n > self.capacity:
+            batch, head, n = batch[-self.capacity:], head + n - self.capacity, self.capacity
+        batch['seq'] = np.arange(head + 1, head + n + 1)
+        self._header[_STARTED] = head + n
+        slots = np.arange(head, head + n) % self.capacity
+        self.records[slots] = batch
+        self._header[_COMMITTED] = head + n
+
+    def since(self, seq):
+        """
+        Records after stream position seq.
+
+        Returns:
+            tuple: (new position, structured array of records, number lost
+                    because the writer lapped this reader)
+        """
+        head = self.head()
+        if head <= seq:
+            return head, self.records[:0].copy(), 0
+        start = max(seq, head - self.capacity)
+        out = self.records[np.arange(start, head) % self.capacity]
+        # Slots the writer may have begun overwriting while we copied
+        unsafe = int(self._header[_STARTED]) - self.capacity
+        if unsafe > start:
+            keep = max(unsafe - start, 0)
+            out = out[keep:]
+            start += keep
+        # A slot whose seq is not the position we asked for was lapped by the
+        # writer (a newer record) or never written; drop through the last one
+        stale = np.flatnonzero(out['seq'] != np.arange(start + 1, start + len(out) + 1))
+        if len(stale):
+            out = out[stale[-1] + 1:]
+            start += stale[-1] + 1
+        return head, out, start - seq
+
+    def wait_since(self, seq, timeout=1.0, poll=0.002):
+        """since(), polling until at least one new record arrives or timeout passes."""
+        deadline = time.monotonic() + timeout
+        while self.head() <= seq and time.monotonic() < deadline:
+            time.sleep(poll)
+        return self.since(seq)
+
+    def latest(self, n=1):
+        """The last n committed records (copied)."""
+        head = self.head()
+        return self.since(max(head - n, 0))[1]
+
+    def close(self):
+        # Views into the buffer must go before the mapping can close
+        self._header = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _attach(name):
+    """Attach without registering for cleanup, so a reader exiting never unlinks the writer's ring."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers with the resource
+        # tracker; skip that registration (unregistering afterwards would
+        # also drop the writer's own entry when both share one tracker)
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda n, rtype: rtype == 'shared_memory' or register(n, rtype)
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+def record_rows(lines, t, t_ns):
+    """RING_DTYPE tuples for raw lines and their arrival times (see LineReader.stamped_lines)."""
+    rows = []
+    for line, line_t, line_t_ns in zip(lines, t, t_ns):
+        sample = parse_line(line)
+        values = sample[2:] if sample is not None else (math.nan,) * 7
+        rows.append((0, line_t, line_t_ns, *values, line[:LINE_BYTES]))
+    return rows
+
+def record_sample(record, device=None):
+    """Sample for a ring record, or None when its line was not a reading."""
+    if record['ax'] != record['ax']:
+        return None
+    return Sample(device, float(record['t']), *(float(record[k]) for k in
+                                                ('ax', 'ay', 'az', 'gx', 'gy', 'gz', 'dist')))
+
+def run_writer(ring_name, args):
+    """
+    Reader process body: pull lines from the configured source and append
+    them to the ring. Runs in its own process so web workers' load never
+    delays serial reads.
+    """
+    ring = ShmRing.attach(ring_name)
+    reader = LineReader(source_from_args(args))
+    try:
+        while reader.is_open:
+            lines, t, t_ns = reader.stamped_lines()
+            if lines:
+                ring.write(record_rows(lines, t, t_ns))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print("Serial error:", e)
+    finally:
+        reader.close()
+        ring.close()
+
+def main():
+    """Standalone writer: own the ring and fill it, for servers started with --ring NAME."""
+    parser = argparse.ArgumentParser(description="Read a sensor source into a shared-memory ring")
+    parser.add_argument('--name', default='crashview', help="Shared memory name")
+    parser.add_argument('--capacity', type=int, default=8192, help="Ring size in records")
+    add_source_arguments(parser, default_format='text')
+    args = parser.parse_args()
+
+    # Unlink the ring on `kill` as well as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    ring = ShmRing(args.name, args.capacity)
+    print(f"💾 Ring {ring.name}: {ring.capacity} × {RING_DTYPE.itemsize} B records")
+    try:
+        run_writer(ring.name, args)
+    finally:
+        print(f"✅ Wrote {ring.head()} records")
+        ring.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import gzip
+import hashlib
+from flask import Response
+
+class StaticAsset:
+    """
+    A page built once at startup and kept in memory in every encoding the
+    server can produce: identity, gzip and (with the brotli package) br.
+    Each variant has its own strong ETag, so a reload that still matches
+    costs a 304, and a fresh load just writes the prebuilt bytes.
+    """
+
+    def __init__(self, body, mimetype='text/html', cache_control='no-cache'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.mimetype = mimetype
+        # no-cache: browsers keep the page but revalidate it (cheaply, by
+        # ETag) on every load, so a restarted server's new page shows at once
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.variants = {'identity': (body, digest),
+                         'gzip': (gzip.compress(body, 9, mtime=0), f'{digest}-gz')}
+        try:
+            import brotli
+        except ImportError:
+            pass
+        else:
+            self.variants['br'] = (brotli.compress(body, quality=11), f'{digest}-br')
+
+    @classmethod
+    def from_file(cls, path, mimetype='text/html', **kwargs):
+        with open(path, 'rb') as f:
+            return cls(f.read(), mimetype, **kwargs)
+
+    def response(self, request):
+        """The best variant the request accepts, or 304 if it already has it."""
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in self.variants and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+        body, etag = self.variants[encoding]
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
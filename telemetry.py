@@ -0,0 +1,132 @@
+import json
+import math
+import re
+import struct
+from collections import namedtuple
+
+# One IMU (+ ultrasound) reading: accel in m/s², gyro in dps, dist in cm
+# (NaN when the device has no ultrasound, inf when it reads "Out of
+# range"); t is the arrival wall time in seconds
+Sample = namedtuple('Sample', ['device', 't', 'ax', 'ay', 'az', 'gx', 'gy', 'gz', 'dist'])
+
+FIELDS = ('ax', 'ay', 'az', 'gx', 'gy', 'gz', 'dist')
+
+# Version of the JSON event schema sent to browsers (bump on breaking changes):
+#   {"v":1,"t":1718.253,"ax":0.12,"ay":-0.03,"az":9.81,"gx":0.35,"gy":-0.18,"gz":0,"dist":42.5}
+#   "t" is seconds (wall clock); "dist" is cm, null when out of range and
+#   absent for devices without ultrasound; "dev" is added by multi-device streams.
+# Decimated streams (see broadcast.py) add "agg" and the window's sample
+# count "n"; with "agg":"minmax" every field is a [min, max] pair.
+# Micro-batched streams send "n" samples per event as columns:
+#   {"v":1,"n":2,"t":[1718.253,1718.263],"ax":[0.12,0.13],...,"dist":[42.5,null]}
+# and so does the "replay" SSE event a reconnecting client gets, plus
+# "lost" when some of the samples it missed are no longer retained.
+SCHEMA_VERSION = 1
+
+# Binary frames (WebSocket), all little-endian: a 16-byte header
+#   b'CV', version u8, channels u8 (8), sample count u16, 2 pad bytes, t0 f8
+# then count × channels float32 rows: t - t0, ax, ay, az, gx, gy, gz, dist
+# (dist NaN without ultrasound, +inf out of range)
+FRAME_HEADER = struct.Struct('<2sBBH2xd')
+FRAME_CHANNELS = 1 + len(FIELDS)
+
+_NUMBER = rb'(-?\d+(?:\.\d*)?)'
+# gyro_accel_arduino.ino: {ax:0.12,ay:-0.03,az:9.81,gx:0.35,gy:-0.18,gz:0.00}
+_BRACE = re.compile(rb'\{ax:' + _NUMBER + rb',ay:' + _NUMBER + rb',az:' + _NUMBER +
+                    rb',gx:' + _NUMBER + rb',gy:' + _NUMBER + rb',gz:' + _NUMBER + rb'\}')
+# ultrasound+gyro.ino: Dist(cm): 42.0  |  Acc(m/s2): 0.12, -0.03, 9.81  |  Gyro(dps): 0.4, -0.2, 0.0
+_TEXT = re.compile(rb'Dist\(cm\):\s*(?:' + _NUMBER + rb'|Out of range)\s*\|\s*'
+                   rb'Acc\(m/s2\):\s*' + _NUMBER + rb',\s*' + _NUMBER + rb',\s*' + _NUMBER + rb'\s*\|\s*'
+                   rb'Gyro\(dps\):\s*' + _NUMBER + rb',\s*' + _NUMBER + rb',\s*' + _NUMBER)
+
+def parse_line(line, device=None, t=math.nan):
+    """
+    Parse one serial line (bytes or str) in either Arduino format.
+
+    Returns:
+        Sample, or None for lines that are not readings (boot messages, noise)
+    """
+    if isinstance(line, str):
+        line = line.encode('utf-8', errors='replace')
+    match = _BRACE.search(line)
+    if match:
+        return Sample(device, t, *map(float, match.groups()), math.nan)
+    match = _TEXT.search(line)
+    if match:
+        dist, *values = match.groups()
+        return Sample(device, t, *map(float, values), math.inf if dist is None else float(dist))
+    return None
+
+def _number(x):
+    # 6 significant digits is finer than the sensors resolve, and hides float32 noise
+    return f'{x:.6g}'
+
+def sample_json(sample):
+    """Compact schema-versioned JSON text for one Sample (see SCHEMA_VERSION)."""
+    parts = [f'{{"v":{SCHEMA_VERSION}']
+    if sample.device is not None:
+        parts.append(f',"dev":{json.dumps(sample.device)}')
+    if sample.t == sample.t:
+        parts.append(f',"t":{sample.t:.3f}')
+    parts.append(f',"ax":{_number(sample.ax)},"ay":{_number(sample.ay)},"az":{_number(sample.az)}'
+                 f',"gx":{_number(sample.gx)},"gy":{_number(sample.gy)},"gz":{_number(sample.gz)}')
+    if sample.dist == sample.dist:
+        parts.append(',"dist":null' if math.isinf(sample.dist) else f',"dist":{_number(sample.dist)}')
+    parts.append('}')
+    return ''.join(parts)
+
+def _value(x):
+    return 'null' if math.isinf(x) else _number(x)
+
+def aggregate_json(device, t, agg, n, columns):
+    """
+    JSON for one decimated window. columns maps each field in FIELDS to a
+    number (mean) or a (min, max) pair; NaN fields are left out.
+    """
+    parts = [f'{{"v":{SCHEMA_VERSION}']
+    if device is not None:
+        parts.append(f',"dev":{json.dumps(device)}')
+    parts.append(f',"t":{t:.3f},"agg":"{agg}","n":{n}')
+    for field in FIELDS:
+        value = columns[field]
+        if isinstance(value, tuple):
+            if value[0] == value[0]:
+                parts.append(f',"{field}":[{_value(value[0])},{_value(value[1])}]')
+        elif value == value:
+            parts.append(f',"{field}":{_value(value)}')
+    parts.append('}')
+    return ''.join(parts)
+
+def batch_json(samples, lost=0):
+    """
+    Columnar JSON for several Samples: one array per field. "dev" is a
+    column too when samples carry a device; "dist" is left out when no
+    sample has an ultrasound reading, otherwise missing values are null.
+    lost > 0 adds how many samples before these are gone ("lost").
+    """
+    parts = [f'{{"v":{SCHEMA_VERSION},"n":{len(samples)}']
+    if lost:
+        parts.append(f',"lost":{lost}')
+    if any(sample.device is not None for sample in samples):
+        devices = json.dumps([sample.device for sample in samples], separators=(',', ':'))
+        parts.append(f',"dev":{devices}')
+    parts.append(',"t":[' + ','.join(f'{s.t:.3f}' if s.t == s.t else 'null' for s in samples) + ']')
+    # No samples (only a lost count) still gives every column, empty
+    columns = list(zip(*samples)) or [()] * (len(FIELDS) + 2)
+    for i, field in enumerate(FIELDS[:-1], start=2):
+        parts.append(f',"{field}":[' + ','.join(map(_number, columns[i])) + ']')
+    dist = columns[-1]
+    if any(d == d for d in dist):
+        parts.append(',"dist":[' + ','.join(_number(d) if math.isfinite(d) else 'null' for d in dist) + ']')
+    parts.append('}')
+    return ''.join(parts)
+
+def pack_frame(samples):
+    """Binary frame (see FRAME_HEADER) for a batch of Samples."""
+    t0 = samples[0].t if samples else math.nan
+    values = []
+    for sample in samples:
+        values.append(sample.t - t0)
+        values.extend(sample[2:])
+    return (FRAME_HEADER.pack(b'CV', SCHEMA_VERSION, FRAME_CHANNELS, len(samples), t0) +
+            struct.pack(f'<{len(values)}f', *values))